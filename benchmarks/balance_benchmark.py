@@ -0,0 +1,57 @@
+"""Time chunking.merge_shortest against the previous quadratic merge.
+
+Both merge the shortest chunk into its neighbour until the target bubble
+count is reached; inputs are ``--sentences`` sentences of random length.
+
+    python -m benchmarks.balance_benchmark --sentences 10000 --target 3
+"""
+
+import argparse
+import random
+import time
+
+from telegram_ai_agent.chunking import merge_shortest
+
+
+def quadratic_merge(chunks: list[str], target: int) -> list[str]:
+    chunks = list(chunks)
+    while len(chunks) > target:
+        shortest = min(range(len(chunks)), key=lambda i: len(chunks[i]))
+        if shortest > 0:
+            chunks[shortest - 1] += " " + chunks.pop(shortest)
+        else:
+            chunks[shortest] += " " + chunks.pop(shortest + 1)
+    return chunks
+
+
+def make_sentences(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        " ".join("word" for _ in range(rng.randint(3, 25))) + "." for _ in range(count)
+    ]
+
+
+def measure(name: str, merge, chunks: list[str], target: int):
+    started = time.perf_counter()
+    merged = merge(chunks, target)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<10} {elapsed * 1000:10.1f} ms  {len(merged)} bubbles")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=10000)
+    parser.add_argument("--target", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    chunks = make_sentences(args.sentences, args.seed)
+    measure(
+        "heap", lambda c, t: merge_shortest(c, t, max_length=10**9), chunks, args.target
+    )
+    measure("quadratic", quadratic_merge, chunks, args.target)
+    measure("heap 4096", merge_shortest, chunks, args.target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Compare the local SentenceChunker with SemanticChunker.
+
+Reports split latency and two quality measures for the bubbles that
+``MessagesHandler.balance_chunks`` would send:
+
+- boundary: share of bubbles ending on a sentence or paragraph boundary
+- balance: coefficient of variation of bubble lengths (lower is more even)
+
+SemanticChunker uses OpenAIEmbeddings when OPENAI_API_KEY is set, otherwise
+deterministic hashed embeddings with a simulated per-request latency. The
+last run splits all replies ``--concurrency`` at a time through
+BatchingEmbeddings and reports throughput and embedding requests made.
+
+    python -m benchmarks.chunking_benchmark --replies 50 --latency 0.25
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import statistics
+import time
+
+from unittest.mock import MagicMock
+
+from langchain_core.embeddings import Embeddings
+from langchain_experimental.text_splitter import SemanticChunker
+
+from telegram_ai_agent.chunking import SentenceChunker
+from telegram_ai_agent.config import TelegramConfig
+from telegram_ai_agent.embeddings import BatchingEmbeddings
+from telegram_ai_agent.messages_handler import MessagesHandler
+
+
+SENTENCES = [
+    "Thanks for reaching out!",
+    "Our basic plan costs $10 a month and includes email support.",
+    "The pro plan adds analytics, priority support and unlimited seats.",
+    "You can cancel at any time from the billing page.",
+    "Most teams start with a two week trial.",
+    "Would you like me to set one up for you?",
+    "I can also send over a short product video.",
+    "Let me know which option works best.",
+]
+
+
+class HashedEmbeddings(Embeddings):
+    """Deterministic offline embeddings with a simulated request latency."""
+
+    def __init__(self, latency: float, dimensions: int = 64):
+        self.latency = latency
+        self.dimensions = dimensions
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        time.sleep(self.latency)
+        return self._embed(text)
+
+    def _embed(self, text):
+        digest = hashlib.sha256(text.encode()).digest()
+        return [digest[i % len(digest)] / 255 for i in range(self.dimensions)]
+
+
+def make_replies(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    replies = []
+    for _ in range(count):
+        sentences = rng.sample(SENTENCES, rng.randint(3, len(SENTENCES)))
+        if rng.random() < 0.5:
+            middle = len(sentences) // 2
+            replies.append(
+                " ".join(sentences[:middle]) + "\n\n" + " ".join(sentences[middle:])
+            )
+        else:
+            replies.append(" ".join(sentences))
+    return replies
+
+
+async def evaluate(name: str, chunker, replies: list[str], config: TelegramConfig):
+    handler = MessagesHandler(MagicMock(), config, chunker)
+    random.seed(0)
+
+    latencies = []
+    boundary_hits = 0
+    bubbles = 0
+    variations = []
+    for reply in replies:
+        started = time.perf_counter()
+        chunks = await handler.balance_chunks(reply)
+        latencies.append(time.perf_counter() - started)
+
+        bubbles += len(chunks)
+        boundary_hits += sum(chunk.rstrip()[-1:] in ".!?…" for chunk in chunks)
+        lengths = [len(chunk) for chunk in chunks]
+        if len(lengths) > 1:
+            variations.append(statistics.pstdev(lengths) / statistics.mean(lengths))
+
+    print(
+        f"{name:<10} "
+        f"mean {statistics.mean(latencies) * 1000:9.3f} ms  "
+        f"p95 {sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000:9.3f} ms  "
+        f"boundary {boundary_hits / bubbles:6.1%}  "
+        f"balance {statistics.mean(variations) if variations else 0:5.2f}"
+    )
+
+
+async def throughput(
+    embeddings, replies: list[str], config: TelegramConfig, concurrency: int
+):
+    batching = BatchingEmbeddings(embeddings, max_concurrency=concurrency)
+    handler = MessagesHandler(MagicMock(), config, SemanticChunker(embeddings=batching))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def split(reply):
+        async with semaphore:
+            await handler.balance_chunks(reply)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(split(reply) for reply in replies))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{'batched':<10} "
+        f"{len(replies) / elapsed:9.1f} replies/s  "
+        f"{batching.stats.requests} requests in {batching.stats.calls} calls  "
+        f"avg batch {batching.stats.average_batch_size:5.1f} texts"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replies", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    config = TelegramConfig(
+        session_name="benchmark",
+        api_id=1,
+        api_hash="benchmark",
+        phone_number="+10000000000",
+    )
+    replies = make_replies(args.replies, args.seed)
+
+    if os.getenv("OPENAI_API_KEY"):
+        from langchain_community.embeddings import OpenAIEmbeddings
+
+        embeddings = OpenAIEmbeddings()
+    else:
+        embeddings = HashedEmbeddings(args.latency)
+
+    await evaluate("sentence", SentenceChunker(config.min_chunk_chars), replies, config)
+    await evaluate("semantic", SemanticChunker(embeddings=embeddings), replies, config)
+    await throughput(embeddings, replies, config, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
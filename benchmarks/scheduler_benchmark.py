@@ -0,0 +1,62 @@
+"""Firing accuracy and CPU cost of TimerWheel versus one asyncio.sleep each.
+
+Runs ``--conversations`` concurrent loops that each sleep ``--sleeps`` random
+delays of up to ``--max-delay`` seconds, like typing bursts and think time.
+
+    python -m benchmarks.scheduler_benchmark --conversations 10000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from telegram_ai_agent.scheduler import TimerWheel
+
+
+async def conversation(sleep, delays: list[float], lags: list[float]):
+    for delay in delays:
+        started = time.monotonic()
+        await sleep(delay)
+        lags.append(time.monotonic() - started - delay)
+
+
+async def measure(name: str, sleep, plans: list[list[float]]):
+    lags: list[float] = []
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    await asyncio.gather(*(conversation(sleep, plan, lags) for plan in plans))
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    lags.sort()
+    print(
+        f"{name:<8} wall {wall:6.2f} s  cpu {cpu:6.2f} s  "
+        f"lag p50 {statistics.median(lags) * 1000:6.1f} ms  "
+        f"p99 {lags[int(len(lags) * 0.99)] * 1000:6.1f} ms  "
+        f"max {lags[-1] * 1000:6.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=10000)
+    parser.add_argument("--sleeps", type=int, default=5)
+    parser.add_argument("--max-delay", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    plans = [
+        [rng.uniform(0.1, args.max_delay) for _ in range(args.sleeps)]
+        for _ in range(args.conversations)
+    ]
+
+    await measure("asyncio", asyncio.sleep, plans)
+    wheel = TimerWheel()
+    await measure("wheel", wheel.sleep, plans)
+    await wheel.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Compare the per-word typing loop with MessagesHandler.plan_typing.
+
+For ``--chunks`` random bubbles reports the sleeps each approach schedules,
+planning CPU time, and the mean and standard deviation of total typing time,
+which should match between the two.
+
+    python -m benchmarks.typing_benchmark --chunks 5000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from unittest.mock import MagicMock
+
+from telegram_ai_agent.config import TelegramConfig
+from telegram_ai_agent.messages_handler import MessagesHandler
+
+
+WORDS = "thanks for reaching out our basic plan costs ten dollars a month".split()
+
+
+def per_word_sleeps(config: TelegramConfig, text: str) -> list[float]:
+    """The sleeps the previous simulate_typing awaited, one per word."""
+    avg_typing_speed = random.uniform(config.min_typing_speed, config.max_typing_speed)
+    words = text.split()
+    sleeps = []
+    words_typed = 0
+    while words_typed < len(words):
+        burst_length = min(
+            random.randint(config.min_burst_length, config.max_burst_length),
+            len(words) - words_typed,
+        )
+        for _ in range(burst_length):
+            base_delay = (60 / avg_typing_speed) * (len(words[words_typed]) / 5)
+            sleeps.append(base_delay * (1 + random.uniform(-0.1, 0.1)))
+            words_typed += 1
+        if words_typed < len(words):
+            sleeps.append(
+                random.uniform(config.min_pause_duration, config.max_pause_duration)
+            )
+    return sleeps
+
+
+def report(name: str, plans: list[list[float]], elapsed: float):
+    totals = [sum(plan) for plan in plans]
+    print(
+        f"{name:<9} "
+        f"{sum(map(len, plans)) / len(plans):6.1f} sleeps/chunk  "
+        f"{elapsed / len(plans) * 1e6:7.1f} us/chunk  "
+        f"typing {statistics.mean(totals):6.2f} s ± {statistics.pstdev(totals):5.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = TelegramConfig(
+        session_name="benchmark",
+        api_id=1,
+        api_hash="benchmark",
+        phone_number="+10000000000",
+    )
+    handler = MessagesHandler(MagicMock(), config, MagicMock())
+    rng = random.Random(args.seed)
+    chunks = [
+        " ".join(rng.choices(WORDS, k=rng.randint(1, args.words)))
+        for _ in range(args.chunks)
+    ]
+
+    random.seed(args.seed)
+    started = time.process_time()
+    plans = [per_word_sleeps(config, chunk) for chunk in chunks]
+    report("per-word", plans, time.process_time() - started)
+
+    random.seed(args.seed)
+    started = time.process_time()
+    plans = [
+        [duration + pause for duration, pause in handler.plan_typing(chunk)]
+        for chunk in chunks
+    ]
+    report("planned", plans, time.process_time() - started)
+
+
+if __name__ == "__main__":
+    main()
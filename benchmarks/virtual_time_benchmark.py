@@ -0,0 +1,128 @@
+"""CPU cost of the real reply pipeline, run in virtual time.
+
+Pushes ``--conversations`` messages through InboundMessaging.handle_messages
+with a VirtualClock, a seeded RNG and an offline session and assistant, so
+only our own code is measured: history, chunking, typing plans, scheduling
+and sending. Delays are recorded instead of slept.
+
+    python -m benchmarks.virtual_time_benchmark --conversations 2000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from types import SimpleNamespace
+
+from telegram_ai_agent.chunking import SentenceChunker
+from telegram_ai_agent.clock import VirtualClock
+from telegram_ai_agent.config import TelegramConfig
+from telegram_ai_agent.inbound import InboundMessaging
+from telegram_ai_agent.rate_limiter import AdaptiveRateLimiter
+from telegram_ai_agent.typing_indicator import TypingIndicatorManager
+
+
+REPLY = (
+    "Thanks for reaching out! Our basic plan costs $10 a month and includes "
+    "email support. The pro plan adds analytics and priority support.\n\n"
+    "Would you like me to set up a two week trial for you?"
+)
+
+
+class OfflineSession:
+    def __init__(self, clock):
+        self.requests = 0
+        self.sent = 0
+        self.typing_indicator = TypingIndicatorManager(self, clock=clock)
+        # High enough that pacing never kicks in; only its overhead is measured.
+        self.rate_limiter = AdaptiveRateLimiter(
+            rate=1e6, max_rate=1e6, burst=1000, clock=clock
+        )
+
+    async def __call__(self, request):
+        self.requests += 1
+
+    async def get_sender_entity(self, event):
+        return await event.get_sender()
+
+    async def send_read_acknowledge(self, *args):
+        self.requests += 1
+
+    async def send_message(self, *args):
+        self.sent += 1
+        return SimpleNamespace(id=random.getrandbits(31), text="", out=True)
+
+    async def iter_messages(self, *args, **kwargs):
+        for message in ():
+            yield message
+
+
+class OfflineAssistant:
+    llm = SimpleNamespace(model="gpt-4o")
+
+    def get_system_prompt(self):
+        return "You are a helpful sales assistant."
+
+    def run(self, messages, stream=False):
+        return REPLY
+
+
+def make_event(session, chat_id: int):
+    sender = SimpleNamespace(id=chat_id, username=f"user{chat_id}")
+    message = SimpleNamespace(id=1, text="How much is it?", out=False)
+
+    async def get_sender():
+        return sender
+
+    async def reply(text):
+        return await session.send_message(sender, text)
+
+    return SimpleNamespace(
+        chat_id=chat_id,
+        text=message.text,
+        message=message,
+        get_sender=get_sender,
+        reply=reply,
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    clock = VirtualClock()
+    config = TelegramConfig(
+        session_name="benchmark",
+        api_id=1,
+        api_hash="benchmark",
+        phone_number="+10000000000",
+        clock=clock,
+        rng=random.Random(args.seed),
+    )
+    session = OfflineSession(clock)
+    inbound = InboundMessaging(session, config, SentenceChunker())
+    assistant = OfflineAssistant()
+
+    started = time.process_time()
+    await asyncio.gather(
+        *(
+            inbound.handle_messages(assistant, [make_event(session, chat_id)])
+            for chat_id in range(args.conversations)
+        )
+    )
+    cpu = time.process_time() - started
+
+    print(
+        f"{args.conversations / cpu:8.0f} conversations/s  "
+        f"{cpu / args.conversations * 1000:6.2f} ms cpu each  "
+        f"{clock.elapsed / args.conversations:6.1f} s simulated each  "
+        f"{session.sent / args.conversations:4.1f} bubbles  "
+        f"{session.requests / args.conversations:4.1f} other requests"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -133,10 +133,12 @@ async def main():
         await agent.start()
 
         # Example: Send a message
-        await agent.send_messages(
+        [result] = await agent.send_messages(
             [TEST_RECIPIENT],
             "Hello! I'm ready to assist you with weather information, news updates, and top Hacker News stories.",
         )
+        if not result.ok:
+            logger.error(f"Failed to send greeting: {result.error or result.status}")
 
         # Process incoming messages
         await agent.process_incoming_messages()
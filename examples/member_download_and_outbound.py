@@ -109,13 +109,16 @@ async def main():
                     assistant, default_message
                 )
 
-                if member["username"]:
-                    await agent.send_messages([member["username"]], unique_message)
-                    logger.info(f"Sent unique message to @{member['username']}")
+                # If no username, use the user's ID
+                recipient = member["username"] or member["id"]
+                [result] = await agent.send_messages([recipient], unique_message)
+                if result.ok:
+                    logger.info(f"Sent unique message to {recipient}")
                 else:
-                    # If no username, use the user's ID
-                    await agent.send_messages([member["id"]], unique_message)
-                    logger.info(f"Sent unique message to user ID: {member['id']}")
+                    logger.error(
+                        f"Failed to send message to {recipient}: "
+                        f"{result.error or result.status}"
+                    )
 
                 # Add a delay to avoid flooding
                 await asyncio.sleep(1)
@@ -72,7 +72,12 @@ async def send_messages(agent):
             unique_welcome = agent.assistant.run(
                 messages=[{"role": "user", "content": welcome_prompt}]
             )
-            await agent.send_messages([recipient], unique_welcome, throttle=1)
+            [result] = await agent.send_messages(
+                [recipient], unique_welcome, throttle=1
+            )
+            if not result.ok:
+                logger.error(f"Error sending messages to {recipient}: {result.error}")
+                continue
             logger.info(f"Sent unique welcome message to {recipient}: {unique_welcome}")
 
             # Generate and send follow-up messages
@@ -80,8 +85,15 @@ async def send_messages(agent):
                 unique_message = agent.assistant.run(
                     messages=[{"role": "user", "content": prompt}]
                 )
-                await agent.send_messages([recipient], unique_message, throttle=1)
-                logger.info(f"Sent unique message to {recipient}: {unique_message}")
+                [result] = await agent.send_messages(
+                    [recipient], unique_message, throttle=1
+                )
+                if result.ok:
+                    logger.info(f"Sent unique message to {recipient}: {unique_message}")
+                else:
+                    logger.error(
+                        f"Error sending message to {recipient}: {result.error}"
+                    )
 
             await asyncio.sleep(5)  # Wait 5 seconds between recipients
         except Exception as e:
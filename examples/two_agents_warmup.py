@@ -66,7 +66,12 @@ async def simulate_conversation(agent1, agent2, topic, turns=3):
             messages=[{"role": "user", "content": context}]
         )
         logger.info(f"{current_agent.config.session_name} says: {message}")
-        await current_agent.send_messages([other_agent.config.phone_number], message)
+        [result] = await current_agent.send_messages(
+            [other_agent.config.phone_number], message
+        )
+        if not result.ok:
+            logger.error(f"Failed to send message: {result.error or result.status}")
+            return
 
         # Wait for the message to be processed
         await asyncio.sleep(2)
@@ -77,7 +82,12 @@ async def simulate_conversation(agent1, agent2, topic, turns=3):
             messages=[{"role": "user", "content": context}]
         )
         logger.info(f"{other_agent.config.session_name} responds: {response}")
-        await other_agent.send_messages([current_agent.config.phone_number], response)
+        [result] = await other_agent.send_messages(
+            [current_agent.config.phone_number], response
+        )
+        if not result.ok:
+            logger.error(f"Failed to send response: {result.error or result.status}")
+            return
 
         # Wait for the response to be processed
         await asyncio.sleep(2)
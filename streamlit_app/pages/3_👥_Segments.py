@@ -202,7 +202,7 @@ with tab5:
 
     if uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
+            df = pd.read_csv(uploaded_file, dtype={"access_hash": "Int64"})
 
             # Define expected columns
             expected_columns = ["id", "username", "first_name", "last_name", "phone"]
@@ -238,7 +238,15 @@ with tab5:
                         )
                         # Filter out rows with null values
                         valid_df = df.dropna(subset=expected_columns)
-                        user_data = valid_df[expected_columns].to_dict("records")
+                        import_columns = expected_columns + [
+                            column for column in ["access_hash"] if column in df.columns
+                        ]
+                        user_data = (
+                            valid_df[import_columns]
+                            .astype(object)
+                            .where(valid_df[import_columns].notna(), None)
+                            .to_dict("records")
+                        )
                         add_users_to_segment(selected_segment_id, user_data)
                         logger.info(
                             f"Users imported to segment '{selected_segment}' successfully!"
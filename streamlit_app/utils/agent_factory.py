@@ -5,11 +5,13 @@ from typing import Callable, Optional
 
 from streamlit_app.utils.assistant_factory import create_phi_assistant
 from streamlit_app.utils.auth_utils import try_auth
+from streamlit_app.utils.database.conversations import SQLConversationStore
 from telegram_ai_agent import TelegramAIAgent, TelegramConfig
 
 
 current_dir = Path(__file__).parents[1].resolve()
 SESSIONS_FOLDER = current_dir / "sessions"
+EMBEDDING_CACHE_PATH = current_dir / "utils" / "database" / "embeddings.db"
 
 
 async def create_telegram_ai_agent(
@@ -86,6 +88,7 @@ async def create_telegram_ai_agent(
         min_read_delay=assistant_data.min_read_delay,
         max_read_delay=assistant_data.max_read_delay,
         chat_history_limit=assistant_data.chat_history_limit,
+        embedding_cache_path=str(EMBEDDING_CACHE_PATH),
     )
 
     auth_success, session = await try_auth(telegram_config, logger)
@@ -101,5 +104,6 @@ async def create_telegram_ai_agent(
         session=session,
         code_callback=code_callback,
         twofa_password_callback=twofa_password_callback,
+        conversation_store=SQLConversationStore(assistant_data.id),
     )
     return agent
@@ -1,8 +1,12 @@
 import asyncio
 
 from streamlit_app.utils.agent_factory import create_telegram_ai_agent
-from streamlit_app.utils.database.campaigns import update_recipient_status
+from streamlit_app.utils.database.campaigns import (
+    update_recipient_peer,
+    update_recipient_status,
+)
 from telegram_ai_agent import TelegramAIAgent
+from telegram_ai_agent.outbound import KnownPeer
 
 
 class CampaignSender:
@@ -13,37 +17,72 @@ class CampaignSender:
     async def send_campaign(self, campaign, recipients):
         await self.agent.start()
         try:
-            for i, recipient in enumerate(recipients):
-                try:
-                    message = campaign.message_template
-                    if campaign.make_unique:
-                        message = await self.make_message_unique(message)
+            done = 0
+            # Send to the stored peer if any, then username, then phone number
+            deliverable = []
+            for recipient in recipients:
+                if recipient.access_hash or recipient.username or recipient.phone:
+                    deliverable.append(recipient)
+                    continue
+                self.logger.error(
+                    f"Error processing recipient {recipient.user_id}: "
+                    "No valid identifier found for recipient"
+                )
+                update_recipient_status(campaign.id, recipient.user_id, "Failed")
+                done += 1
+                yield done, len(recipients), "Failed (No valid identifier found)"
 
-                    # Try to send message using username first, then phone number, then user_id
-                    recipient_identifier = recipient.username or recipient.phone
-                    if not recipient_identifier:
-                        raise ValueError("No valid identifier found for recipient")
+            message = campaign.message_template
+            if campaign.make_unique:
 
-                    await self.agent.send_messages(
-                        [recipient_identifier], message, throttle=campaign.throttle
-                    )
+                async def unique_message(_recipient):
+                    return await self.make_message_unique(campaign.message_template)
+
+                message = unique_message
+
+            async for result in self.agent.outbound.iter_deliveries(
+                [self.address(recipient) for recipient in deliverable],
+                message,
+                throttle=campaign.throttle,
+            ):
+                recipient = deliverable[result.index]
+                done += 1
+                if result.ok:
+                    peer = result.peer
+                    if (peer.user_id, peer.access_hash) != (
+                        recipient.peer_id,
+                        recipient.access_hash,
+                    ):
+                        update_recipient_peer(
+                            campaign.id,
+                            recipient.user_id,
+                            peer.user_id,
+                            peer.access_hash,
+                        )
                     update_recipient_status(campaign.id, recipient.user_id, "Sent")
-                    yield i + 1, len(recipients), "Sent"
-                except Exception as e:
-                    self.logger.error(
-                        f"Error processing recipient {recipient.user_id}: {str(e)}"
-                    )
+                    yield done, len(recipients), "Sent"
+                else:
                     update_recipient_status(campaign.id, recipient.user_id, "Failed")
-                    yield i + 1, len(recipients), f"Failed ({str(e)})"
+                    yield (
+                        done,
+                        len(recipients),
+                        f"Failed ({result.error or result.status})",
+                    )
         finally:
             await self.agent.stop()
 
+    @staticmethod
+    def address(recipient):
+        identifier = recipient.username or recipient.phone
+        if recipient.peer_id and recipient.access_hash:
+            return KnownPeer(recipient.peer_id, recipient.access_hash, identifier)
+        return identifier
+
     async def make_message_unique(self, message_template):
         prompt = f"Make the following message unique while preserving its main content and intent:\n\n{message_template}"
-        response = self.agent.assistant.run(
-            messages=[{"role": "user", "content": prompt}], stream=False
+        return await self.agent.llm_runner.run(
+            self.agent.assistant, [{"role": "user", "content": prompt}]
         )
-        return str(response)
 
 
 async def send_campaign(campaign, recipients, assistant_data, logger):
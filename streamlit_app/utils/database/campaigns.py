@@ -32,7 +32,12 @@ def create_campaign(
         )
         for user in segment_users:
             recipient = CampaignRecipient(
-                campaign_id=campaign.id, user_id=user.user_id, username=user.username
+                campaign_id=campaign.id,
+                user_id=user.user_id,
+                username=user.username,
+                phone=user.phone,
+                peer_id=user.peer_id,
+                access_hash=user.access_hash,
             )
             session.add(recipient)
         session.commit()
@@ -103,6 +108,30 @@ def update_recipient_status(campaign_id, user_id, status):
         session.close()
 
 
+def update_recipient_peer(campaign_id, user_id, peer_id, access_hash):
+    """Remember a resolved peer on the recipient and its segment user."""
+    session = Session()
+    try:
+        recipient = (
+            session.query(CampaignRecipient)
+            .filter_by(campaign_id=campaign_id, user_id=user_id)
+            .first()
+        )
+        if recipient:
+            recipient.peer_id = peer_id
+            recipient.access_hash = access_hash
+            session.query(SegmentUser).filter(
+                SegmentUser.segment_id == recipient.campaign.segment_id,
+                SegmentUser.user_id == user_id,
+            ).update({"peer_id": peer_id, "access_hash": access_hash})
+            session.commit()
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+
 def delete_campaign_recipient(campaign_id, user_id):
     session = Session()
     try:
@@ -0,0 +1,77 @@
+import asyncio
+
+from typing import Optional
+
+from sqlalchemy.dialects.sqlite import insert
+
+from telegram_ai_agent.history import ConversationStore, HistoryEntry
+
+from .models import ConversationMessage
+from .session import get_db_session
+
+
+class SQLConversationStore(ConversationStore):
+    """Conversation log for one assistant, kept in the app's SQLite database."""
+
+    def __init__(self, assistant_id: int, session_scope=get_db_session):
+        self.assistant_id = assistant_id
+        self.session_scope = session_scope
+
+    async def append(self, chat_id: int, entries: list[HistoryEntry]):
+        if entries:
+            await asyncio.to_thread(self._append, chat_id, entries)
+
+    async def last_messages(
+        self, chat_id: int, limit: int, token_budget: Optional[int] = None
+    ) -> list[HistoryEntry]:
+        return await asyncio.to_thread(
+            self._last_messages, chat_id, limit, token_budget
+        )
+
+    def _append(self, chat_id: int, entries: list[HistoryEntry]):
+        with self.session_scope() as session:
+            session.execute(
+                insert(ConversationMessage)
+                .values(
+                    [
+                        {
+                            "assistant_id": self.assistant_id,
+                            "chat_id": chat_id,
+                            "message_id": entry.message_id,
+                            "role": entry.role,
+                            "content": entry.content,
+                            "token_count": entry.token_count,
+                        }
+                        for entry in entries
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+
+    def _last_messages(
+        self, chat_id: int, limit: int, token_budget: Optional[int]
+    ) -> list[HistoryEntry]:
+        with self.session_scope() as session:
+            rows = (
+                session.query(ConversationMessage)
+                .filter_by(assistant_id=self.assistant_id, chat_id=chat_id)
+                .order_by(ConversationMessage.message_id.desc())
+                .limit(limit)
+                .all()
+            )
+
+            entries = []
+            used_tokens = 0
+            for row in rows:
+                used_tokens += row.token_count
+                if token_budget is not None and used_tokens > token_budget:
+                    break
+                entries.append(
+                    HistoryEntry(
+                        message_id=row.message_id,
+                        role=row.role,
+                        content=row.content,
+                        token_count=row.token_count,
+                    )
+                )
+            return entries[::-1]
@@ -1,4 +1,15 @@
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -69,6 +80,29 @@ class Assistant(Base):
     campaigns = relationship(
         "Campaign", back_populates="assistant", cascade="all, delete-orphan"
     )
+    conversation_messages = relationship(
+        "ConversationMessage",
+        back_populates="assistant",
+        cascade="all, delete-orphan",
+    )
+
+
+class ConversationMessage(Base):
+    __tablename__ = "conversation_messages"
+    __table_args__ = (
+        UniqueConstraint("assistant_id", "chat_id", "message_id"),
+        Index("ix_conversation_messages_chat", "assistant_id", "chat_id", "message_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    assistant_id = Column(Integer, ForeignKey("assistants.id", ondelete="CASCADE"))
+    chat_id = Column(BigInteger)
+    message_id = Column(BigInteger)
+    role = Column(String)
+    content = Column(String)
+    token_count = Column(Integer)
+
+    assistant = relationship("Assistant", back_populates="conversation_messages")
 
 
 class Segment(Base):
@@ -95,6 +129,9 @@ class SegmentUser(Base):
     first_name = Column(String)
     last_name = Column(String)
     phone = Column(String)
+    # Resolved peer, valid only for the account that resolved it
+    peer_id = Column(BigInteger, nullable=True)
+    access_hash = Column(BigInteger, nullable=True)
 
     segment = relationship("Segment", back_populates="users")
 
@@ -127,6 +164,9 @@ class CampaignRecipient(Base):
     campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"))
     user_id = Column(String)
     username = Column(String)
+    phone = Column(String, nullable=True)
+    peer_id = Column(BigInteger, nullable=True)
+    access_hash = Column(BigInteger, nullable=True)
     status = Column(String, default="Pending")
     sent_at = Column(DateTime, nullable=True)
 
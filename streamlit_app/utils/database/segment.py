@@ -76,6 +76,8 @@ def add_users_to_segment(segment_id, user_data_list):
     session = Session()
     try:
         for user_data in user_data_list:
+            # Exports from get_chat_members carry the access hash as well
+            access_hash = user_data.get("access_hash")
             segment_user = SegmentUser(
                 segment_id=segment_id,
                 user_id=user_data["id"],
@@ -83,6 +85,8 @@ def add_users_to_segment(segment_id, user_data_list):
                 first_name=user_data["first_name"],
                 last_name=user_data["last_name"],
                 phone=user_data["phone"],
+                peer_id=int(user_data["id"]) if access_hash else None,
+                access_hash=int(access_hash) if access_hash else None,
             )
             session.add(segment_user)
         session.commit()
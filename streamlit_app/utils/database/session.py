@@ -1,7 +1,9 @@
+import os
+
 from contextlib import contextmanager
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import QueuePool
 
@@ -11,8 +13,9 @@ from .models import Base
 # Get the directory of the current script
 current_dir = Path(__file__).parent.resolve()
 
-# Set the SQLite database path relative to the current directory
-DB_PATH = current_dir / "sqlite.db"
+# Set the SQLite database path relative to the current directory, unless
+# overridden (tests point it at a temporary file)
+DB_PATH = Path(os.environ.get("STREAMLIT_APP_DB_PATH", current_dir / "sqlite.db"))
 
 # Ensure the directory for the database exists
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -39,6 +42,26 @@ Session = scoped_session(session_factory)
 Base.metadata.create_all(engine)
 
 
+def add_missing_columns():
+    """Add columns introduced since a table was created; ``create_all`` won't."""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(engine.dialect)
+                    connection.execute(
+                        text(
+                            f"ALTER TABLE {table.name} "
+                            f"ADD COLUMN {column.name} {column_type}"
+                        )
+                    )
+
+
+add_missing_columns()
+
+
 @contextmanager
 def get_db_session():
     """Provide a transactional scope around a series of operations."""
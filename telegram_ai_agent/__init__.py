@@ -1,6 +1,27 @@
-from .agent import TelegramAIAgent
-from .config import TelegramConfig
-from .session import TelegramSession
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from .agent import TelegramAIAgent
+    from .config import TelegramConfig
+    from .session import TelegramSession
 
 
 __all__ = ["TelegramAIAgent", "TelegramConfig", "TelegramSession"]
+
+# Exports are imported on first access so that ``import telegram_ai_agent``
+# doesn't pull in telethon, phi and langchain up front.
+_EXPORTS = {
+    "TelegramAIAgent": ".agent",
+    "TelegramConfig": ".config",
+    "TelegramSession": ".session",
+}
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
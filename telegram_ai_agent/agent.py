@@ -1,33 +1,46 @@
 import asyncio
 import logging
 
-from typing import Callable, Optional
-
-from langchain.embeddings import OpenAIEmbeddings
-from langchain_experimental.text_splitter import SemanticChunker
-from phi.assistant.assistant import Assistant
-from phi.llm.openai.chat import OpenAIChat
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, Optional
 
+from .chunking import LazyChunker, SentenceChunker, TextChunker
 from .config import TelegramConfig
+from .history import ConversationStore
 from .inbound import InboundMessaging
+from .llm import LLMRunner
 from .outbound import OutboundMessaging
+from .scheduler import TimerWheel
 from .session import TelegramSession
 from .tools import TelegramTools
 
 
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+    from phi.assistant.assistant import Assistant
+
+    from .response_cache import ResponseCache
+
+
 class TelegramAIAgent:
     def __init__(
         self,
-        assistant: Assistant,
+        assistant: "Assistant",
         config: TelegramConfig,
         logger: Optional[logging.Logger] = None,
         session: Optional[TelegramSession] = None,
         code_callback: Optional[Callable[[], asyncio.Future[str]]] = None,
         twofa_password_callback: Optional[Callable[[], asyncio.Future[str]]] = None,
+        conversation_store: Optional[ConversationStore] = None,
+        response_cache: Optional["ResponseCache"] = None,
+        text_splitter: Optional[TextChunker] = None,
     ):
         if not assistant.llm:
             raise ValueError("Assistant must have an LLM")
 
+        # Already imported by whoever built the assistant, so this is free.
+        from phi.llm.openai.chat import OpenAIChat
+
         if not isinstance(assistant.llm, OpenAIChat):
             raise ValueError("Assistant must use OpenAI LLM")
 
@@ -40,23 +53,72 @@ class TelegramAIAgent:
             twofa_password_callback=twofa_password_callback,
             logger=self.logger,
         )
-        self.embeddings = OpenAIEmbeddings(api_key=assistant.llm.api_key)
-        self.text_splitter = SemanticChunker(embeddings=self.embeddings)
+        self._text_splitter = text_splitter
+        self.llm_runner = LLMRunner(config.llm_concurrency, logger=self.logger)
+        self.scheduler = TimerWheel(
+            config.scheduler_tick,
+            max_typing=config.max_typing_indicators,
+            clock=config.clock,
+            logger=self.logger,
+        )
 
+        # One lazy chunker for both sides, so its lock is the only path that
+        # builds the splitter and its embeddings.
+        chunker = LazyChunker(lambda: self.text_splitter)
         self.inbound = InboundMessaging(
             self.session,
             self.config,
             logger=self.logger,
-            text_splitter=self.text_splitter,
+            text_splitter=chunker,
+            llm_runner=self.llm_runner,
+            conversation_store=conversation_store,
+            response_cache=response_cache,
+            scheduler=self.scheduler,
         )
         self.outbound = OutboundMessaging(
             self.session,
             self.config,
             logger=self.logger,
-            text_splitter=self.text_splitter,
+            text_splitter=chunker,
+            scheduler=self.scheduler,
+            history=self.inbound.history,
         )
         self.tools = TelegramTools(self.session, logger=self.logger)
 
+    @cached_property
+    def embeddings(self) -> "Embeddings":
+        from langchain.embeddings import OpenAIEmbeddings
+
+        from .embeddings import BatchingEmbeddings, CachedEmbeddings
+
+        return BatchingEmbeddings(
+            CachedEmbeddings(
+                OpenAIEmbeddings(api_key=self.assistant.llm.api_key),
+                max_size=self.config.embedding_cache_size,
+                db_path=self.config.embedding_cache_path,
+            ),
+            max_batch_size=self.config.embedding_batch_size,
+            max_delay=self.config.embedding_batch_delay,
+        )
+
+    @property
+    def text_splitter(self) -> TextChunker:
+        """The chunker, built on first use so idle agents never load langchain."""
+        if self._text_splitter is None:
+            self._text_splitter = self.create_text_splitter()
+        return self._text_splitter
+
+    def create_text_splitter(self) -> TextChunker:
+        if self.config.chunking_strategy == "semantic":
+            from langchain_experimental.text_splitter import SemanticChunker
+
+            return SemanticChunker(embeddings=self.embeddings)
+        if self.config.chunking_strategy == "sentence":
+            return SentenceChunker(min_chunk_chars=self.config.min_chunk_chars)
+        raise ValueError(
+            f"Unknown chunking_strategy: {self.config.chunking_strategy!r}"
+        )
+
     async def start(self):
         try:
             if not self.session.is_connected():
@@ -72,12 +134,16 @@ class TelegramAIAgent:
 
     async def stop(self):
         self.logger.info("Stopping Telegram AI Agent...")
+        await self.inbound.stop()
+        await self.scheduler.stop()
         if self.session:
             await self.session.stop()
         self.logger.info("Telegram AI Agent stopped.")
 
-    async def send_messages(self, recipients, message, throttle=0):
-        await self.outbound.send_messages(recipients, message, throttle)
+    async def send_messages(self, recipients, message, throttle=0, concurrency=None):
+        return await self.outbound.send_messages(
+            recipients, message, throttle, concurrency
+        )
 
     async def process_incoming_messages(self):
         await self.inbound.process_messages(self.assistant)
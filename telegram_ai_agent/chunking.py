@@ -0,0 +1,182 @@
+import heapq
+import re
+import threading
+
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Callable, Optional, Protocol
+
+
+PARAGRAPH_PATTERN = re.compile(r"\n\s*\n")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?…])\s+")
+BOUNDARY_PATTERN = re.compile(r"\n\s*\n|(?<=[.!?…])\s+")
+MAX_MESSAGE_LENGTH = 4096
+
+
+class TextChunker(Protocol):
+    """Anything that splits a reply into candidate bubbles.
+
+    ``MessagesHandler.balance_chunks`` merges the pieces down to the number of
+    messages it wants to send, so chunkers only need to cut at sensible
+    places. LangChain text splitters such as ``SemanticChunker`` qualify.
+    """
+
+    def split_text(self, text: str) -> list[str]: ...
+
+
+class SentenceChunker:
+    """Local chunker cutting at paragraph and sentence boundaries.
+
+    Sentences shorter than ``min_chunk_chars`` are glued to the following ones
+    of the same paragraph, so bubbles never consist of a lone "Sure!" unless
+    it stands as its own paragraph. Needs no embeddings or network access.
+    """
+
+    def __init__(self, min_chunk_chars: int = 40):
+        self.min_chunk_chars = min_chunk_chars
+
+    def split_text(self, text: str) -> list[str]:
+        chunks = []
+        for paragraph in PARAGRAPH_PATTERN.split(text):
+            current = ""
+            for sentence in SENTENCE_PATTERN.split(paragraph.strip()):
+                current = f"{current} {sentence}" if current else sentence
+                if len(current) >= self.min_chunk_chars:
+                    chunks.append(current)
+                    current = ""
+            if current:
+                chunks.append(current)
+        return chunks
+
+
+class LazyChunker:
+    """Builds the real chunker with ``factory`` on the first ``split_text``."""
+
+    def __init__(self, factory: Callable[[], TextChunker]):
+        self.factory = factory
+        self._chunker: Optional[TextChunker] = None
+        self._lock = threading.Lock()
+
+    def split_text(self, text: str) -> list[str]:
+        if self._chunker is None:
+            # split_text runs in worker threads, so only one may build it.
+            with self._lock:
+                if self._chunker is None:
+                    self._chunker = self.factory()
+        return self._chunker.split_text(text)
+
+
+def split_oversized(
+    chunks: list[str], max_length: int = MAX_MESSAGE_LENGTH
+) -> list[str]:
+    """Cut chunks longer than ``max_length`` at the last whitespace that fits."""
+    result = []
+    for chunk in chunks:
+        while len(chunk) > max_length:
+            cut = max(chunk.rfind(" ", 0, max_length), chunk.rfind("\n", 0, max_length))
+            if cut <= 0:
+                cut = max_length
+            result.append(chunk[:cut].rstrip())
+            chunk = chunk[cut:].lstrip()
+        if chunk:
+            result.append(chunk)
+    return result
+
+
+def merge_shortest(
+    chunks: list[str], target: int, max_length: int = MAX_MESSAGE_LENGTH
+) -> list[str]:
+    """Merge the shortest chunk into a neighbour until ``target`` chunks remain.
+
+    The shortest chunk joins the one before it (the first chunk absorbs the
+    second), ties going to the earlier chunk. Merges that would exceed
+    ``max_length`` fall back to the following neighbour or are skipped, so
+    fewer merges than requested may happen. Lengths live in a heap with lazy
+    invalidation and neighbours in index links, making this O(n log n).
+    """
+    total = len(chunks)
+    count = total
+    lengths = [len(chunk) for chunk in chunks]
+    following = list(range(1, total + 1))
+    preceding = list(range(-1, total - 1))
+    heap = [(length, index) for index, length in enumerate(lengths)]
+    heapq.heapify(heap)
+
+    while count > target and heap:
+        length, index = heapq.heappop(heap)
+        if length != lengths[index]:
+            continue
+
+        neighbours = (
+            [preceding[index], following[index]] if index else [following[index]]
+        )
+        for neighbour in neighbours:
+            if neighbour >= total or length + 1 + lengths[neighbour] > max_length:
+                continue
+            left, right = min(index, neighbour), max(index, neighbour)
+            lengths[left] += 1 + lengths[right]
+            lengths[right] = -1
+            following[left] = following[right]
+            if following[right] < total:
+                preceding[following[right]] = left
+            heapq.heappush(heap, (lengths[left], left))
+            count -= 1
+            break
+
+    merged = []
+    index = 0
+    while index < total:
+        merged.append(" ".join(chunks[index : following[index]]))
+        index = following[index]
+    return merged
+
+
+class IncrementalChunker:
+    """Splits streamed text into message bubbles as soon as they are complete.
+
+    A bubble ends at a paragraph break or at a sentence end once it holds at
+    least ``min_chunk_chars`` characters. After ``max_chunks - 1`` bubbles
+    everything else is kept for the final one.
+    """
+
+    def __init__(self, min_chunk_chars: int = 80, max_chunks: int = 3):
+        self.min_chunk_chars = min_chunk_chars
+        self.max_chunks = max(max_chunks, 1)
+        self.emitted = 0
+        self._buffer = ""
+
+    def feed(self, delta: str) -> list[str]:
+        self._buffer += delta
+        chunks = []
+        while self.emitted < self.max_chunks - 1:
+            boundary = self._find_boundary()
+            if boundary is None:
+                break
+            chunk, self._buffer = self._buffer[:boundary], self._buffer[boundary:]
+            chunk = chunk.strip()
+            if chunk:
+                chunks.append(chunk)
+                self.emitted += 1
+        return chunks
+
+    def flush(self) -> list[str]:
+        chunk, self._buffer = self._buffer.strip(), ""
+        if not chunk:
+            return []
+        self.emitted += 1
+        return [chunk]
+
+    def _find_boundary(self):
+        for match in BOUNDARY_PATTERN.finditer(self._buffer):
+            is_paragraph = "\n" in match.group()
+            if match.start() >= self.min_chunk_chars or (
+                is_paragraph and self._buffer[: match.start()].strip()
+            ):
+                return match.end()
+        return None
+
+    async def split_stream(self, deltas: AsyncIterable[str]) -> AsyncIterator[str]:
+        async for delta in deltas:
+            for chunk in self.feed(delta):
+                yield chunk
+        for chunk in self.flush():
+            yield chunk
@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+from contextvars import ContextVar
+from typing import NamedTuple
+
+
+class TimelineEntry(NamedTuple):
+    start: float
+    delay: float
+    label: str
+
+
+class Clock:
+    """Real monotonic time and ``asyncio.sleep``."""
+
+    virtual = False
+
+    def time(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, delay: float, label: str = ""):
+        await asyncio.sleep(delay)
+
+
+class VirtualClock(Clock):
+    """Time that only moves when something sleeps, and then instantly.
+
+    Every ``sleep`` is recorded in ``timeline`` and advances the virtual time
+    of the calling task without waiting, so a reply that would take half a
+    minute runs in microseconds. Each asyncio task keeps its own virtual time,
+    starting from that of the task that created it, which keeps concurrent
+    conversations from advancing each other's clocks.
+    """
+
+    virtual = True
+
+    def __init__(self, start: float = 0.0):
+        self.timeline: list[TimelineEntry] = []
+        self._now: ContextVar[float] = ContextVar("virtual_time", default=start)
+
+    def time(self) -> float:
+        return self._now.get()
+
+    async def sleep(self, delay: float, label: str = ""):
+        now = self._now.get()
+        delay = max(delay, 0.0)
+        self.timeline.append(TimelineEntry(now, delay, label))
+        self._now.set(now + delay)
+        # Still yield, so concurrent tasks interleave as they would for real.
+        await asyncio.sleep(0)
+
+    @property
+    def elapsed(self) -> float:
+        """Total simulated delay across all tasks."""
+        return sum(entry.delay for entry in self.timeline)
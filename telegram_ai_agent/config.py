@@ -1,6 +1,11 @@
-from dataclasses import dataclass
+import random
+
+from dataclasses import dataclass, field
 from typing import Optional
 
+from .clock import Clock
+from .filters import InboundFilter
+
 
 @dataclass
 class TelegramConfig:
@@ -15,6 +20,12 @@ class TelegramConfig:
     typing_delay_max: float = 30.0
     inter_chunk_delay_min: float = 1.5
     inter_chunk_delay_max: float = 4.0
+    chunking_strategy: str = "sentence"  # sentence or semantic
+    min_chunk_chars: int = 40
+    embedding_cache_size: int = 10000
+    embedding_cache_path: Optional[str] = None  # SQLite file shared across agents
+    embedding_batch_size: int = 2048
+    embedding_batch_delay: float = 0.005
     min_messages: int = 1
     max_messages: int = 3
     min_typing_speed: float = 100.0  # words per minute
@@ -27,3 +38,30 @@ class TelegramConfig:
     min_read_delay: float = 0.5
     max_read_delay: float = 2.0
     chat_history_limit: int = 100
+    history_token_budget: Optional[int] = None  # defaults to the model's window
+    response_token_reserve: int = 4096
+    history_cache_size: int = 1000
+    history_refresh_interval: float = 300.0
+    entity_cache_size: int = 10000
+    entity_cache_ttl: float = 3600.0
+    inbound_filter: InboundFilter = field(default_factory=InboundFilter)
+    llm_concurrency: int = 4
+    stream_responses: bool = False
+    stream_min_chunk_chars: int = 80
+    max_concurrent_replies: int = 10
+    message_debounce_window: float = 1.0
+    message_debounce_max_wait: float = 10.0
+    supersede_replies: bool = True
+    outbound_concurrency: int = 1
+    split_cache_size: int = 128  # distinct outbound messages kept pre-split
+    send_rate: float = 1.0  # messages per second, adapted on FloodWait
+    min_send_rate: float = 0.05
+    max_send_rate: float = 5.0
+    send_burst: int = 5
+    send_rate_recovery: float = 0.01  # messages per second regained each second
+    flood_wait_retries: int = 3
+    max_flood_wait: float = 300.0
+    scheduler_tick: float = 0.01
+    max_typing_indicators: Optional[int] = None
+    clock: Clock = field(default_factory=Clock)
+    rng: Optional[random.Random] = None  # defaults to the global random module
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import time
+
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass
+class DispatcherStats:
+    queued: int = 0
+    in_flight: int = 0
+    processed: int = 0
+    failed: int = 0
+    batches: int = 0
+    superseded: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    @property
+    def average_wait_time(self) -> float:
+        completed = self.processed + self.failed
+        return self.total_wait_time / completed if completed else 0.0
+
+    @property
+    def average_batch_size(self) -> float:
+        return (self.processed + self.failed) / self.batches if self.batches else 0.0
+
+
+class InboundDispatcher:
+    """Serializes work per chat and caps the number of replies in flight.
+
+    Each chat gets its own FIFO queue drained by a single worker task, so two
+    messages from the same user never race each other. Workers share a global
+    semaphore of ``max_concurrency`` slots. Wait time is measured from
+    submission until the item acquires a slot.
+
+    Items are handed to ``handler`` in batches: everything queued for a chat is
+    taken at once, and with a ``debounce_window`` the worker keeps collecting
+    until the chat has been quiet for that long (bounded by
+    ``debounce_max_wait`` since the first item of the batch).
+
+    With ``supersede`` set, a new item for a chat whose batch is still being
+    handled cancels that handler; the interrupted batch is put back in front
+    of the new item and handled again together with it.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[int, list[Any]], Awaitable[None]],
+        max_concurrency: int = 10,
+        debounce_window: float = 0.0,
+        debounce_max_wait: float = 10.0,
+        supersede: bool = False,
+        logger=None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.debounce_window = debounce_window
+        self.debounce_max_wait = debounce_max_wait
+        self.supersede = supersede
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = DispatcherStats()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queues: dict[int, asyncio.Queue] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._running: dict[int, asyncio.Task] = {}
+
+    def submit(self, chat_id: int, item: Any):
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = asyncio.Queue()
+
+        queue.put_nowait((time.monotonic(), item))
+        self.stats.queued += 1
+
+        if chat_id not in self._workers:
+            self._workers[chat_id] = asyncio.create_task(self._drain(chat_id, queue))
+        elif self.supersede and chat_id in self._running:
+            self._running[chat_id].cancel()
+
+    def queue_depth(self, chat_id: int) -> int:
+        queue = self._queues.get(chat_id)
+        return queue.qsize() if queue else 0
+
+    @property
+    def active_chats(self) -> int:
+        return len(self._workers)
+
+    async def _drain(self, chat_id: int, queue: asyncio.Queue):
+        interrupted: list[tuple[float, Any]] = []
+        try:
+            while not queue.empty():
+                batch = interrupted + await self._collect_batch(queue)
+                interrupted = []
+                async with self._semaphore:
+                    now = time.monotonic()
+                    for enqueued_at, _ in batch:
+                        self._record_wait(now - enqueued_at)
+                    self.stats.queued -= len(batch)
+                    self.stats.in_flight += 1
+                    self.stats.batches += 1
+                    task = asyncio.create_task(
+                        self.handler(chat_id, [item for _, item in batch])
+                    )
+                    self._running[chat_id] = task
+                    try:
+                        await asyncio.wait([task])
+                    except asyncio.CancelledError:
+                        task.cancel()
+                        raise
+                    finally:
+                        self._running.pop(chat_id, None)
+                        self.stats.in_flight -= 1
+
+                if task.cancelled() and not queue.empty():
+                    self.stats.superseded += 1
+                    self.stats.queued += len(batch)
+                    interrupted = batch
+                elif task.cancelled() or task.exception():
+                    self.stats.failed += len(batch)
+                    self.logger.error(
+                        f"Error handling message for chat {chat_id}: "
+                        f"{'cancelled' if task.cancelled() else str(task.exception())}"
+                    )
+                else:
+                    self.stats.processed += len(batch)
+        finally:
+            self._workers.pop(chat_id, None)
+            self._queues.pop(chat_id, None)
+
+    async def _collect_batch(self, queue: asyncio.Queue) -> list[tuple[float, Any]]:
+        batch = [queue.get_nowait()]
+
+        if self.debounce_window > 0:
+            deadline = batch[0][0] + self.debounce_max_wait
+            while True:
+                timeout = min(self.debounce_window, deadline - time.monotonic())
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+
+    def _record_wait(self, wait_time: float):
+        self.stats.total_wait_time += wait_time
+        self.stats.max_wait_time = max(self.stats.max_wait_time, wait_time)
+
+    async def stop(self):
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self.stats.queued = 0
@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from langchain_core.embeddings import Embeddings
+
+from .cache import TTLCache
+
+
+@dataclass
+class EmbeddingCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return hits / lookups if lookups else 0.0
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that never embeds the same text twice.
+
+    Vectors are keyed by a SHA-256 of the model name and the text. Lookups go
+    to an in-memory LRU first, then to an optional SQLite file at ``db_path``
+    that agent processes on the same host can share, and only the remaining
+    texts are sent to the wrapped ``embeddings`` in a single request. Vectors
+    are held as float32 arrays, a tenth of the memory of a list of floats.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_size: int = 10000,
+        db_path: Optional[str] = None,
+    ):
+        self.embeddings = embeddings
+        self.namespace = getattr(embeddings, "model", None) or type(embeddings).__name__
+        self.stats = EmbeddingCacheStats()
+        self._memory = TTLCache(max_size=max_size)
+        self._lock = threading.Lock()
+        self._db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._embed(texts, "document", self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(
+            [text], "query", lambda texts: [self.embeddings.embed_query(texts[0])]
+        )[0]
+
+    def _embed(self, texts: list[str], kind: str, embed) -> list[list[float]]:
+        keys = [self._key(kind, text) for text in texts]
+        counts = Counter(keys)
+        vectors: dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for key, count in counts.items():
+                vector = self._memory.get(key)
+                if vector is not None:
+                    vectors[key] = vector
+                    self.stats.memory_hits += count
+
+        missing = [key for key in counts if key not in vectors]
+        loaded = self._load(missing)
+        with self._lock:
+            for key, vector in loaded.items():
+                vectors[key] = vector
+                self._memory.set(key, vector)
+                self.stats.disk_hits += counts[key]
+
+        pending = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if pending:
+            embedded = {
+                key: np.asarray(vector, dtype=np.float32)
+                for key, vector in zip(pending, embed(list(pending.values())))
+            }
+            with self._lock:
+                for key, vector in embedded.items():
+                    vectors[key] = vector
+                    self._memory.set(key, vector)
+                    self.stats.misses += counts[key]
+            self._save(embedded)
+
+        return [vectors[key].tolist() for key in keys]
+
+    def _key(self, kind: str, text: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{kind}\0{text}".encode()).hexdigest()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._db is None and self._db_path:
+            self._db = sqlite3.connect(
+                self._db_path, timeout=30, check_same_thread=False
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _load(self, keys: list[str]) -> dict[str, np.ndarray]:
+        if not keys or not self._db_path:
+            return {}
+        with self._db_lock:
+            db = self._connect()
+            rows = db.execute(
+                "SELECT key, vector FROM embeddings "
+                f"WHERE key IN ({','.join('?' * len(keys))})",
+                keys,
+            ).fetchall()
+        return {key: np.frombuffer(vector, dtype=np.float32) for key, vector in rows}
+
+    def _save(self, vectors: dict[str, np.ndarray]):
+        if not self._db_path:
+            return
+        with self._db_lock:
+            db = self._connect()
+            db.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.tobytes()) for key, vector in vectors.items()],
+            )
+            db.commit()
+
+
+@dataclass
+class EmbeddingBatchStats:
+    requests: int = 0
+    texts: int = 0
+    calls: int = 0
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.texts / self.calls if self.calls else 0.0
+
+
+class BatchingEmbeddings(Embeddings):
+    """Merges concurrent ``embed_documents`` calls into fewer API requests.
+
+    The first request opens a ``max_delay`` second window. Everything that
+    arrives during it is sent to the wrapped ``embeddings`` together, split
+    into calls of at most ``max_batch_size`` texts, and each caller gets its
+    own slice of the results back. A full batch is flushed immediately.
+
+    Calls from worker threads (e.g. a chunker's ``split_text`` running via
+    ``asyncio.to_thread``) block only their thread; ``aembed_documents``
+    awaits the batch without blocking the loop.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_batch_size: int = 2048,
+        max_delay: float = 0.005,
+        max_concurrency: int = 4,
+    ):
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.stats = EmbeddingBatchStats()
+        self._pending: list[tuple[list[str], Future]] = []
+        self._pending_texts = 0
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="embeddings"
+        )
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.submit(texts).result()
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embeddings.embed_query(text)
+
+    def submit(self, texts: list[str]) -> Future:
+        future: Future = Future()
+        if not texts:
+            future.set_result([])
+            return future
+
+        with self._lock:
+            self._pending.append((list(texts), future))
+            self._pending_texts += len(texts)
+            self.stats.requests += 1
+            if self._pending_texts >= self.max_batch_size:
+                batch = self._take_pending()
+                self._executor.submit(self._run, batch)
+            elif not self._scheduled:
+                self._scheduled = True
+                self._executor.submit(self._flush_after_delay)
+        return future
+
+    def _take_pending(self) -> list[tuple[list[str], Future]]:
+        batch, self._pending, self._pending_texts = self._pending, [], 0
+        return batch
+
+    def _flush_after_delay(self):
+        time.sleep(self.max_delay)
+        with self._lock:
+            self._scheduled = False
+            batch = self._take_pending()
+        self._run(batch)
+
+    def _run(self, batch: list[tuple[list[str], Future]]):
+        if not batch:
+            return
+        texts = [text for request, _ in batch for text in request]
+        try:
+            vectors = []
+            for start in range(0, len(texts), self.max_batch_size):
+                vectors.extend(
+                    self.embeddings.embed_documents(
+                        texts[start : start + self.max_batch_size]
+                    )
+                )
+                with self._lock:
+                    self.stats.calls += 1
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self.stats.texts += len(texts)
+        offset = 0
+        for request, future in batch:
+            future.set_result(vectors[offset : offset + len(request)])
+            offset += len(request)
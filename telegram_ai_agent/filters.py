@@ -0,0 +1,82 @@
+import time
+
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .cache import TTLCache
+
+
+@dataclass
+class InboundFilter:
+    """Declarative rules deciding which incoming messages get a reply.
+
+    ``check`` only reads fields already present on the event, so rejected
+    messages cost no network requests, delays or LLM calls. Rejections are
+    counted per reason in ``rejected``.
+    """
+
+    private_only: bool = True
+    ignore_bots: bool = True
+    allowed_ids: Optional[set[int]] = None
+    blocked_ids: set[int] = field(default_factory=set)
+    min_length: int = 1
+    max_length: Optional[int] = None
+    rate_limit: Optional[int] = None  # messages per peer per rate_window
+    rate_window: float = 60.0
+
+    rejected: Counter = field(
+        default_factory=Counter, init=False, repr=False, compare=False
+    )
+    _recent: TTLCache = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._recent = TTLCache(max_size=10000, ttl=self.rate_window)
+
+    def check(self, event) -> Optional[str]:
+        """Return why ``event`` should be ignored, or None to accept it."""
+        reason = self._rejection_reason(event)
+        if reason:
+            self.rejected[reason] += 1
+        return reason
+
+    def _rejection_reason(self, event) -> Optional[str]:
+        message = event.message
+        if event.out:
+            return "self"
+        if getattr(message, "action", None) is not None:
+            return "service"
+        if self.private_only and not event.is_private:
+            return "not_private"
+        if self.ignore_bots and (
+            getattr(event.sender, "bot", False) or getattr(message, "via_bot_id", None)
+        ):
+            return "bot"
+        if event.sender_id in self.blocked_ids:
+            return "blocked"
+        if self.allowed_ids is not None and event.sender_id not in self.allowed_ids:
+            return "not_allowed"
+
+        length = len((event.text or "").strip())
+        if length < self.min_length:
+            return "too_short"
+        if self.max_length is not None and length > self.max_length:
+            return "too_long"
+
+        if self.rate_limit is not None and self._rate_limited(event.sender_id):
+            return "rate_limited"
+        return None
+
+    def _rate_limited(self, sender_id: int) -> bool:
+        now = time.monotonic()
+        recent = self._recent.get(sender_id)
+        if recent is None:
+            recent = deque()
+        while recent and now - recent[0] > self.rate_window:
+            recent.popleft()
+
+        limited = len(recent) >= self.rate_limit
+        if not limited:
+            recent.append(now)
+        self._recent.set(sender_id, recent)
+        return limited
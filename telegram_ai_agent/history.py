@@ -0,0 +1,200 @@
+import bisect
+import time
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from .session import TelegramSession
+from .tokens import DEFAULT_MODEL, encoding_name, message_tokens
+
+
+@dataclass
+class HistoryEntry:
+    message_id: int
+    role: str
+    content: str
+    token_count: int = 0  # counted for DEFAULT_MODEL, the count stores persist
+    # Counts for other encodings, made on first use
+    token_counts: dict[str, int] = field(default_factory=dict, compare=False)
+
+    def tokens(self, model: str = DEFAULT_MODEL) -> int:
+        encoding = encoding_name(model)
+        if encoding == encoding_name(DEFAULT_MODEL):
+            return self.token_count
+        count = self.token_counts.get(encoding)
+        if count is None:
+            count = self.token_counts[encoding] = message_tokens(self.content, model)
+        return count
+
+    @classmethod
+    def from_message(cls, message) -> "HistoryEntry":
+        role = "assistant" if message.out else "user"
+        content = message.text or ""
+        return cls(
+            message_id=message.id,
+            role=role,
+            content=content,
+            token_count=message_tokens(content),
+        )
+
+
+class ConversationStore(ABC):
+    """Persistent, append-only message log per chat.
+
+    Implementations are scoped to a single assistant. ``append`` must ignore
+    messages that are already stored, and ``last_messages`` returns entries
+    in chronological order.
+    """
+
+    @abstractmethod
+    async def append(self, chat_id: int, entries: list[HistoryEntry]): ...
+
+    @abstractmethod
+    async def last_messages(
+        self, chat_id: int, limit: int, token_budget: Optional[int] = None
+    ) -> list[HistoryEntry]: ...
+
+
+@dataclass
+class ChatHistory:
+    limit: int
+    entries: list[HistoryEntry] = field(default_factory=list)
+    synced_at: float = 0.0
+    synced_id: int = 0
+
+    @property
+    def last_message_id(self) -> int:
+        return self.entries[-1].message_id if self.entries else 0
+
+    def add(self, entry: HistoryEntry) -> bool:
+        index = bisect.bisect_left(
+            self.entries, entry.message_id, key=lambda e: e.message_id
+        )
+        if (
+            index < len(self.entries)
+            and self.entries[index].message_id == entry.message_id
+        ):
+            self.entries[index] = entry
+            return False
+
+        self.entries.insert(index, entry)
+        if len(self.entries) > self.limit:
+            del self.entries[: len(self.entries) - self.limit]
+        return True
+
+
+class ChatHistoryCache:
+    """Keeps the last ``limit`` messages of recently active chats in memory.
+
+    A chat is seeded with one ``iter_messages`` call the first time it is
+    needed. After that it is kept current from NewMessage events and our own
+    sends via ``record``, and only re-synced with ``min_id`` (new messages
+    only) once ``refresh_interval`` seconds have passed, which picks up
+    anything sent from other devices. The least recently used chats are
+    evicted once more than ``max_chats`` are cached.
+
+    With a ``store``, every message that enters the cache is also appended to
+    it, and chats are seeded from the store before falling back to Telegram,
+    so a restarted agent rebuilds context without history requests. Messages
+    that arrived while the agent was down are picked up by the next refresh.
+    """
+
+    def __init__(
+        self,
+        session: TelegramSession,
+        limit: int = 100,
+        max_chats: int = 1000,
+        refresh_interval: float = 300.0,
+        store: Optional[ConversationStore] = None,
+    ):
+        self.session = session
+        self.limit = limit
+        self.max_chats = max_chats
+        self.refresh_interval = refresh_interval
+        self.store = store
+        self._chats: OrderedDict[int, ChatHistory] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._chats)
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self._chats
+
+    async def record(self, chat_id: int, message):
+        """Add a message to a cached chat. Uncached chats are seeded on demand."""
+        history = self._chats.get(chat_id)
+        if history is not None and message is not None and message.text:
+            entry = HistoryEntry.from_message(message)
+            if history.add(entry) and self.store:
+                await self.store.append(chat_id, [entry])
+
+    def invalidate(self, chat_id: int):
+        self._chats.pop(chat_id, None)
+
+    async def sync(self, chat_id: int) -> ChatHistory:
+        """Seed the chat if it isn't cached, or refresh it once it is stale."""
+        history = self._chats.get(chat_id)
+        if history is None:
+            return await self._seed(chat_id)
+
+        self._chats.move_to_end(chat_id)
+        if time.monotonic() - history.synced_at >= self.refresh_interval:
+            await self._refresh(chat_id, history)
+        return history
+
+    async def get(
+        self,
+        chat_id: int,
+        token_budget: Optional[int] = None,
+        model: str = DEFAULT_MODEL,
+    ) -> list[dict[str, Any]]:
+        """Chronological history, newest messages first to fit ``token_budget``.
+
+        Tokens are counted with ``model``'s encoding, once per entry.
+        """
+        history = await self.sync(chat_id)
+
+        messages = []
+        used_tokens = 0
+        for entry in reversed(history.entries):
+            used_tokens += entry.tokens(model)
+            if token_budget is not None and used_tokens > token_budget:
+                break
+            messages.append({"role": entry.role, "content": entry.content})
+        return messages[::-1]
+
+    async def _seed(self, chat_id: int) -> ChatHistory:
+        history = ChatHistory(limit=self.limit)
+        self._chats[chat_id] = history
+        while len(self._chats) > self.max_chats:
+            self._chats.popitem(last=False)
+
+        if self.store:
+            for entry in await self.store.last_messages(chat_id, self.limit):
+                history.add(entry)
+            if history.entries:
+                self._mark_synced(history)
+                return history
+
+        await self._fetch(chat_id, history, limit=self.limit)
+        return history
+
+    async def _refresh(self, chat_id: int, history: ChatHistory):
+        await self._fetch(chat_id, history, limit=self.limit, min_id=history.synced_id)
+
+    async def _fetch(self, chat_id: int, history: ChatHistory, **kwargs):
+        fetched = []
+        async for message in self.session.iter_messages(chat_id, **kwargs):
+            if message.text:
+                entry = HistoryEntry.from_message(message)
+                if history.add(entry):
+                    fetched.append(entry)
+        if fetched and self.store:
+            await self.store.append(chat_id, fetched[::-1])
+        self._mark_synced(history)
+
+    def _mark_synced(self, history: ChatHistory):
+        history.synced_at = time.monotonic()
+        history.synced_id = history.last_message_id
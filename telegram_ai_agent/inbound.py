@@ -1,56 +1,195 @@
 import asyncio
-import random
 
-from typing import Any
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Optional
 
-from phi.assistant.assistant import Assistant
 from telethon import events
 
+from .chunking import TextChunker
+from .config import TelegramConfig
+from .dispatcher import InboundDispatcher
+from .history import ChatHistoryCache, ConversationStore
+from .llm import LLMRunner
 from .messages_handler import MessagesHandler
+from .scheduler import TimerWheel
+from .session import TelegramSession
+from .tokens import DEFAULT_MODEL, context_window, count_tokens, load_encoding
+
+
+if TYPE_CHECKING:
+    from phi.assistant.assistant import Assistant
+
+    from .response_cache import ResponseCache
 
 
 class InboundMessaging(MessagesHandler):
-    async def get_chat_history(self, user_id: int) -> list[dict[str, Any]]:
-        messages = []
-        async for message in self.session.iter_messages(
-            user_id, limit=self.config.chat_history_limit
-        ):
-            role = "user" if message.out else "assistant"
-            messages.append({"role": role, "content": message.text})
-        return messages[::-1]  # Reverse to get chronological order
-
-    async def process_messages(self, assistant: Assistant):
+    def __init__(
+        self,
+        session: TelegramSession,
+        config: TelegramConfig,
+        text_splitter: TextChunker,
+        logger=None,
+        llm_runner: Optional[LLMRunner] = None,
+        conversation_store: Optional[ConversationStore] = None,
+        response_cache: Optional["ResponseCache"] = None,
+        scheduler: Optional[TimerWheel] = None,
+    ):
+        super().__init__(
+            session, config, text_splitter, logger=logger, scheduler=scheduler
+        )
+        self.llm_runner = llm_runner or LLMRunner(
+            config.llm_concurrency, logger=self.logger
+        )
+        self.dispatcher: Optional[InboundDispatcher] = None
+        self.response_cache = response_cache
+        # A fresh copy so rate-limit state isn't shared between agents
+        self.inbound_filter = replace(config.inbound_filter)
+        self.history = ChatHistoryCache(
+            session,
+            limit=config.chat_history_limit,
+            max_chats=config.history_cache_size,
+            refresh_interval=config.history_refresh_interval,
+            store=conversation_store,
+        )
+
+    async def get_chat_history(
+        self,
+        chat_id: int,
+        token_budget: Optional[int] = None,
+        model: str = DEFAULT_MODEL,
+    ) -> list[dict[str, Any]]:
+        return await self.history.get(chat_id, token_budget=token_budget, model=model)
+
+    @staticmethod
+    def assistant_model(assistant: "Assistant") -> str:
+        return getattr(assistant.llm, "model", None) or DEFAULT_MODEL
+
+    def history_token_budget(self, assistant: "Assistant") -> int:
+        """Tokens left for chat history once instructions and the reply fit."""
+        model = self.assistant_model(assistant)
+        budget = self.config.history_token_budget or (
+            context_window(model) - self.config.response_token_reserve
+        )
+        system_prompt = assistant.get_system_prompt()
+        if system_prompt:
+            budget -= count_tokens(system_prompt, model)
+        return max(budget, 0)
+
+    async def acknowledge_after(self, delay: float, sender, message):
+        await self.scheduler.sleep(delay, "read")
+        await self.session.send_read_acknowledge(sender, message)
+
+    async def handle_messages(self, assistant: "Assistant", events_batch: list):
+        event = events_batch[-1]
+        text = "\n".join(e.text for e in events_batch if e.text)
+
+        chat_id = event.chat_id
+        sender = await self.session.get_sender_entity(event)
+
+        self.logger.info(
+            f"Received {len(events_batch)} message(s) from {sender.username}: {text}"
+        )
+
+        # Reading and generating overlap: the read receipt is sent after a
+        # human-like delay while history and the LLM call are already running,
+        # and the reply only starts once both are done.
+        read_delay = len(text) * self.config.read_delay_factor + self.rng.uniform(
+            self.config.min_read_delay, self.config.max_read_delay
+        )
+        read_receipt = asyncio.create_task(
+            self.acknowledge_after(read_delay, sender, event.message)
+        )
+        deltas = None
+        try:
+            # The batch is part of the history, so replies that were cut short
+            # by a newer message keep their place in the conversation.
+            await self.history.sync(chat_id)
+            for queued_event in events_batch:
+                await self.history.record(chat_id, queued_event.message)
+            messages = await self.get_chat_history(
+                chat_id,
+                token_budget=self.history_token_budget(assistant),
+                model=self.assistant_model(assistant),
+            )
+
+            cached_chunks = None
+            if self.response_cache is not None:
+                from .response_cache import assistant_scope
+
+                scope = assistant_scope(assistant)
+                # Judged on the whole cached chat, not the budget-trimmed one.
+                conversation_so_far = await self.get_chat_history(chat_id)
+                cached_chunks = await self.response_cache.lookup(
+                    scope, text, conversation_so_far
+                )
+
+            if cached_chunks:
+                await read_receipt
+                conversation = self.simulate_chunks(cached_chunks, sender)
+            elif self.config.stream_responses:
+                deltas = self.llm_runner.stream(assistant, messages)
+                await read_receipt
+                conversation = self.simulate_stream(deltas, sender)
+            else:
+                response = await self.llm_runner.run(assistant, messages)
+                await read_receipt
+                conversation = self.simulate_conversation(response, sender)
+
+            sent_messages = []
+            async for message in conversation:
+                if not sent_messages:
+                    sent = await self.session.rate_limiter.call(event.reply, message)
+                else:
+                    sent = await self.session.rate_limiter.call(
+                        self.session.send_message, sender, message
+                    )
+                sent_messages.append(message)
+                await self.history.record(chat_id, sent)
+
+            if self.response_cache is not None and not cached_chunks:
+                await self.response_cache.store(
+                    scope, text, sent_messages, conversation_so_far
+                )
+        finally:
+            read_receipt.cancel()
+            if deltas:
+                deltas.stop()
+
+        self.logger.info(f"Sent to {sender.username}: {' '.join(sent_messages)}")
+
+    async def process_messages(self, assistant: "Assistant"):
+        # Load encodings before any handler needs one, so a download on first
+        # use doesn't stall the event loop.
+        for model in {DEFAULT_MODEL, self.assistant_model(assistant)}:
+            await load_encoding(model)
+
+        self.dispatcher = InboundDispatcher(
+            lambda chat_id, batch: self.handle_messages(assistant, batch),
+            max_concurrency=self.config.max_concurrent_replies,
+            debounce_window=self.config.message_debounce_window,
+            debounce_max_wait=self.config.message_debounce_max_wait,
+            supersede=self.config.supersede_replies,
+            logger=self.logger,
+        )
+
         @self.session.on(events.NewMessage(incoming=True))
         async def handle_new_message(event):
-            try:
-                sender = await event.get_sender()
-                user_id = sender.id
+            reason = self.inbound_filter.check(event)
+            if reason:
+                self.logger.debug(f"Ignoring message from {event.sender_id}: {reason}")
+                return
 
-                self.logger.info(f"Received from {sender.username}: {event.text}")
+            await self.history.record(event.chat_id, event.message)
+            self.dispatcher.submit(event.chat_id, event)
 
-                read_delay = len(
-                    event.text
-                ) * self.config.read_delay_factor + random.uniform(
-                    self.config.min_read_delay, self.config.max_read_delay
-                )
-                await asyncio.sleep(read_delay)
-                await self.session.send_read_acknowledge(sender, event.message)
-
-                chat_history = await self.get_chat_history(user_id)
-                messages = [*chat_history, {"role": "user", "content": event.text}]
-                response = assistant.run(messages=messages, stream=False)
-
-                first_message = True
-                async for message in self.simulate_conversation(str(response), sender):
-                    if first_message:
-                        await event.reply(message)
-                        first_message = False
-                    else:
-                        await self.session.send_message(sender, message)
-
-                self.logger.info(f"Sent to {sender.username}: {response}")
-            except Exception as e:
-                self.logger.error(f"Error processing message: {str(e)}")
-                raise e
+        # Messages this account sends elsewhere, e.g. campaigns run by another
+        # agent or other devices, are part of the conversation too.
+        @self.session.on(events.NewMessage(outgoing=True))
+        async def handle_outgoing_message(event):
+            await self.history.record(event.chat_id, event.message)
 
         self.logger.info("Started processing incoming messages")
+
+    async def stop(self):
+        if self.dispatcher:
+            await self.dispatcher.stop()
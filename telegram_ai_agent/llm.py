@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from phi.assistant.assistant import Assistant
+
+
+_FINISHED = object()
+
+
+class LLMRunner:
+    """Runs blocking assistant calls off the event loop.
+
+    phi's ``Assistant.run`` performs a synchronous HTTP request, so every call is
+    pushed to a bounded thread pool. ``max_concurrency`` caps how many LLM
+    requests a single agent keeps in flight; extra calls wait for a free worker
+    without blocking the loop.
+
+    ``stream`` iterates ``Assistant.run(stream=True)`` on a worker and relays
+    each delta to the loop as it arrives, so callers can act on the first
+    tokens while the rest is still generating.
+    """
+
+    def __init__(self, max_concurrency: int = 4, logger=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.max_concurrency = max_concurrency
+        self.logger = logger or logging.getLogger(__name__)
+        self.in_flight = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="llm"
+        )
+
+    async def run(self, assistant: "Assistant", messages: list[dict[str, Any]]) -> str:
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        try:
+            response = await loop.run_in_executor(
+                self._executor, partial(assistant.run, messages=messages, stream=False)
+            )
+        finally:
+            self.in_flight -= 1
+        return str(response)
+
+    def stream(
+        self, assistant: "Assistant", messages: list[dict[str, Any]]
+    ) -> "LLMStream":
+        """Start generating right away and return an iterator over the deltas."""
+        loop = asyncio.get_running_loop()
+        stream = LLMStream()
+
+        def produce():
+            try:
+                for delta in assistant.run(messages=messages, stream=True):
+                    if stream.stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(stream.queue.put_nowait, delta)
+            except Exception as e:
+                loop.call_soon_threadsafe(stream.queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(stream.queue.put_nowait, _FINISHED)
+
+        self.in_flight += 1
+        future = loop.run_in_executor(self._executor, produce)
+        future.add_done_callback(lambda _: self._release())
+        return stream
+
+    def _release(self):
+        self.in_flight -= 1
+
+
+class LLMStream:
+    """Deltas of a generation running on a worker thread.
+
+    ``stop`` tells the worker to abandon the generation, e.g. when the reply is
+    superseded before it has been fully consumed.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.stopped = threading.Event()
+
+    def __aiter__(self) -> "LLMStream":
+        return self
+
+    async def __anext__(self) -> str:
+        item = await self.queue.get()
+        if item is _FINISHED:
+            self.stop()
+            raise StopAsyncIteration
+        if isinstance(item, Exception):
+            self.stop()
+            raise item
+        return str(item)
+
+    def stop(self):
+        self.stopped.set()
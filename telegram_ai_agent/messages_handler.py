@@ -2,89 +2,194 @@ import asyncio
 import logging
 import random
 
-from collections.abc import AsyncGenerator
-
-from langchain_experimental.text_splitter import SemanticChunker
-from telethon.tl.functions.messages import SetTypingRequest
-from telethon.tl.types import SendMessageTypingAction
-
+from collections.abc import AsyncGenerator, AsyncIterable
+from functools import cache
+from typing import Optional
+
+from .chunking import (
+    IncrementalChunker,
+    TextChunker,
+    merge_shortest,
+    split_oversized,
+)
 from .config import TelegramConfig
+from .scheduler import TimerWheel
 from .session import TelegramSession
 
 
+# Below this many words NumPy's per-call overhead outweighs vectorizing.
+NUMPY_MIN_WORDS = 128
+
+
+@cache
+def _numpy():
+    try:
+        import numpy
+
+        return numpy
+    except ImportError:
+        return None
+
+
 class MessagesHandler:
     def __init__(
         self,
         session: TelegramSession,
         config: TelegramConfig,
-        text_splitter: SemanticChunker,
+        text_splitter: TextChunker,
         logger=None,
+        scheduler: Optional[TimerWheel] = None,
     ):
         self.session = session
         self.config = config
         self.text_splitter = text_splitter
         self.logger = logger or logging.getLogger(__name__)
-
-    def balance_chunks(self, text: str) -> list[str]:
-        chunks = self.text_splitter.split_text(text)
-        target_messages = random.randint(
-            self.config.min_messages, min(self.config.max_messages, len(chunks))
+        self.rng = config.rng or random
+        self.scheduler = scheduler or TimerWheel(
+            config.scheduler_tick,
+            max_typing=config.max_typing_indicators,
+            clock=config.clock,
+            logger=self.logger,
         )
 
-        while len(chunks) > target_messages:
-            shortest = min(range(len(chunks)), key=lambda i: len(chunks[i]))
-            if shortest > 0:
-                chunks[shortest - 1] += " " + chunks.pop(shortest)
-            else:
-                chunks[shortest] += " " + chunks.pop(shortest + 1)
+    async def balance_chunks(self, text: str) -> list[str]:
+        return self.merge_chunks(await self.split_chunks(text))
 
-        return chunks
+    async def split_chunks(self, text: str) -> list[str]:
+        # Splitters may embed the text over the network, so keep them off the loop.
+        chunks = await asyncio.to_thread(self.text_splitter.split_text, text)
+        return split_oversized(chunks)
 
-    async def simulate_typing(self, text: str, user):
-        avg_typing_speed = random.uniform(
-            self.config.min_typing_speed, self.config.max_typing_speed
-        )
-        words = text.split()
-        total_words = len(words)
-        words_typed = 0
-
-        while words_typed < total_words:
-            burst_length = min(
-                random.randint(
-                    self.config.min_burst_length, self.config.max_burst_length
-                ),
-                total_words - words_typed,
-            )
+    def merge_chunks(self, chunks: list[str]) -> list[str]:
+        if not chunks:
+            return chunks
 
-            await self.session(
-                SetTypingRequest(peer=user, action=SendMessageTypingAction())
-            )
+        most = min(self.config.max_messages, len(chunks))
+        target_messages = self.rng.randint(min(self.config.min_messages, most), most)
+        return merge_shortest(chunks, target_messages)
 
-            for _ in range(burst_length):
-                word = words[words_typed]
-                word_length = len(word)
-                base_delay = (60 / avg_typing_speed) * (word_length / 5)
-                variation = random.uniform(-0.1, 0.1)
-                typing_delay = base_delay * (1 + variation)
-                await asyncio.sleep(typing_delay)
-                words_typed += 1
-
-            if words_typed < total_words:
-                pause_duration = random.uniform(
-                    self.config.min_pause_duration, self.config.max_pause_duration
-                )
-                await asyncio.sleep(pause_duration)
+    def plan_typing(self, text: str) -> list[tuple[float, float]]:
+        """Precompute the typing timeline of ``text`` as (burst, pause) seconds.
 
-    async def simulate_conversation(self, text: str, user) -> AsyncGenerator[str, None]:
-        chunks = self.balance_chunks(text)
+        Words are typed in bursts of ``min_burst_length`` to ``max_burst_length``
+        words at one speed per chunk, each word taking its length in 5-char
+        units ±10%, with a pause between bursts. Long texts are vectorized with
+        NumPy when it is installed; both paths draw from the same distributions.
+        """
+        words = text.split()
+        if not words:
+            return []
 
-        for chunk in chunks:
-            if self.config.set_typing:
-                await self.simulate_typing(chunk, user)
+        avg_typing_speed = self.rng.uniform(
+            self.config.min_typing_speed, self.config.max_typing_speed
+        )
+        seconds_per_char = 60 / avg_typing_speed / 5
+        min_burst = max(self.config.min_burst_length, 1)
+        max_burst = max(self.config.max_burst_length, min_burst)
+
+        np = _numpy() if len(words) >= NUMPY_MIN_WORDS else None
+        if np is None:
+            timeline = []
+            index = 0
+            while index < len(words):
+                end = min(index + self.rng.randint(min_burst, max_burst), len(words))
+                duration = sum(
+                    len(word) * seconds_per_char * (1 + self.rng.uniform(-0.1, 0.1))
+                    for word in words[index:end]
+                )
+                index = end
+                pause = (
+                    self.rng.uniform(
+                        self.config.min_pause_duration, self.config.max_pause_duration
+                    )
+                    if index < len(words)
+                    else 0.0
+                )
+                timeline.append((duration, pause))
+            return timeline
+
+        rng = np.random.default_rng(self.rng.getrandbits(64))
+        lengths = np.fromiter(map(len, words), dtype=float, count=len(words))
+        delays = lengths * seconds_per_char * (1 + rng.uniform(-0.1, 0.1, len(words)))
+        bursts = rng.integers(
+            min_burst, max_burst, size=-(-len(words) // min_burst), endpoint=True
+        )
+        ends = np.cumsum(bursts)
+        starts = np.concatenate(([0], ends[ends < len(words)]))
+        durations = np.add.reduceat(delays, starts)
+        pauses = rng.uniform(
+            self.config.min_pause_duration,
+            self.config.max_pause_duration,
+            len(durations),
+        )
+        pauses[-1] = 0.0
+        return list(zip(durations.tolist(), pauses.tolist()))
 
-            yield chunk
+    async def simulate_typing(self, text: str, user):
+        with self.scheduler.typing_slot() as show_typing:
+            if not show_typing:
+                for duration, pause in self.plan_typing(text):
+                    await self.scheduler.sleep(duration + pause, "typing")
+                return
+
+            indicator = self.session.typing_indicator
+            try:
+                for duration, pause in self.plan_typing(text):
+                    # Keep the indicator up through long bursts, not just at their start.
+                    while duration > (visible := await indicator.ensure(user)):
+                        await self.scheduler.sleep(visible, "typing")
+                        duration -= visible
+                    await self.scheduler.sleep(duration + pause, "typing")
+            except BaseException:
+                await indicator.cancel(user)
+                raise
+            # The bubble sent next ends the indicator on its own.
+            indicator.discard(user)
 
-            think_time = random.uniform(
+    async def simulate_conversation(self, text: str, user) -> AsyncGenerator[str, None]:
+        chunks = await self.balance_chunks(text)
+        async for message in self.simulate_chunks(chunks, user):
+            yield message
+
+    async def simulate_chunks(
+        self, chunks: list[str], user
+    ) -> AsyncGenerator[str, None]:
+        for index, chunk in enumerate(chunks):
+            async for message in self._simulate_chunk(chunk, user, first=not index):
+                yield message
+
+    async def simulate_stream(
+        self, deltas: AsyncIterable[str], user
+    ) -> AsyncGenerator[str, None]:
+        """Like ``simulate_conversation``, but for text that is still generating.
+
+        Each bubble is typed and yielded as soon as the chunker completes it.
+        """
+        chunker = IncrementalChunker(
+            min_chunk_chars=self.config.stream_min_chunk_chars,
+            max_chunks=self.rng.randint(
+                self.config.min_messages, self.config.max_messages
+            ),
+        )
+        first = True
+        async for chunk in chunker.split_stream(deltas):
+            for bubble in split_oversized([chunk]):
+                async for message in self._simulate_chunk(bubble, user, first):
+                    yield message
+                first = False
+
+    async def _simulate_chunk(
+        self, chunk: str, user, first: bool = False
+    ) -> AsyncGenerator[str, None]:
+        # Think time only separates bubbles, so a reply is finished, and can no
+        # longer be superseded, as soon as its last bubble is sent.
+        if not first:
+            think_time = self.rng.uniform(
                 self.config.inter_chunk_delay_min, self.config.inter_chunk_delay_max
             )
-            await asyncio.sleep(think_time)
+            await self.scheduler.sleep(think_time, "think")
+
+        if self.config.set_typing:
+            await self.simulate_typing(chunk, user)
+
+        yield chunk
@@ -1,30 +1,183 @@
 import asyncio
+import weakref
 
-from telethon.errors import FloodWaitError
+from collections.abc import AsyncIterator, Awaitable
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+from telethon.errors import FloodWaitError, PeerIdInvalidError, UserIdInvalidError
 from telethon.tl.types import InputPeerUser
 
+from .cache import TTLCache
+from .history import ChatHistoryCache
 from .messages_handler import MessagesHandler
 
 
+# A fixed text, or a coroutine function building the text for a recipient.
+MessageSource = Union[str, Callable[[Any], Awaitable[str]]]
+
+
+# What Telegram answers when an access hash doesn't belong to this account.
+STALE_PEER_ERRORS = (PeerIdInvalidError, UserIdInvalidError)
+
+
+@dataclass(frozen=True)
+class KnownPeer:
+    """A user whose id and access hash were stored earlier.
+
+    Sending to it needs no resolution. If Telegram rejects the hash, e.g.
+    because another account fetched it, ``fallback`` (a username or phone)
+    is resolved instead.
+    """
+
+    user_id: int
+    access_hash: int
+    fallback: Any = None
+
+
+@dataclass
+class DeliveryResult:
+    index: int
+    recipient: Any
+    status: str = "failed"  # sent, skipped or failed
+    chunks_sent: int = 0
+    error: Optional[str] = None
+    peer: Optional[InputPeerUser] = None  # what the message was sent to
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "sent"
+
+
 class OutboundMessaging(MessagesHandler):
-    async def send_messages(self, recipients: list, message: str, throttle: float = 0):
-        for recipient in recipients:
-            try:
-                user = await self.session.get_input_entity(recipient)
-                if isinstance(user, InputPeerUser):
-                    async for chunk in self.simulate_conversation(message, user):
-                        await self.session.send_message(user, chunk)
-
-                    self.logger.info(f"Message sent to {recipient}")
-                else:
-                    self.logger.warning(f"Skipping invalid recipient: {recipient}")
+    def __init__(self, *args, history: Optional[ChatHistoryCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The inbound history, so replies to our messages see what we sent.
+        self.history = history
+        self._peer_locks: weakref.WeakValueDictionary[int, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self._splits = TTLCache(max_size=self.config.split_cache_size)
+
+    async def send_messages(
+        self,
+        recipients: list,
+        message: MessageSource,
+        throttle: float = 0,
+        concurrency: Optional[int] = None,
+    ) -> list[DeliveryResult]:
+        """Deliver ``message`` to every recipient; results are in input order."""
+        results: list[Optional[DeliveryResult]] = [None] * len(recipients)
+        async for result in self.iter_deliveries(
+            recipients, message, throttle, concurrency
+        ):
+            results[result.index] = result
+        return results
+
+    async def iter_deliveries(
+        self,
+        recipients: list,
+        message: MessageSource,
+        throttle: float = 0,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[DeliveryResult]:
+        """Hold up to ``concurrency`` conversations at once, yielding as they end.
 
+        Defaults to ``config.outbound_concurrency``. Each conversation keeps its
+        slot for ``throttle`` seconds after its last bubble. A failing recipient
+        is reported in its result and never stops the others.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.config.outbound_concurrency)
+
+        async def run(index: int, recipient) -> DeliveryResult:
+            async with semaphore:
+                result = await self.deliver(index, recipient, message)
                 if throttle > 0:
                     await asyncio.sleep(throttle)
+                return result
+
+        tasks = [
+            asyncio.create_task(run(index, recipient))
+            for index, recipient in enumerate(recipients)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def deliver(
+        self, index: int, recipient, message: MessageSource
+    ) -> DeliveryResult:
+        result = DeliveryResult(index=index, recipient=recipient)
+        text = None
+        can_refresh = isinstance(recipient, KnownPeer) and recipient.fallback
+        try:
+            for refresh in (False, True):
+                user = await self.resolve(recipient, refresh)
+                if not isinstance(user, InputPeerUser):
+                    self.logger.warning(f"Skipping invalid recipient: {recipient}")
+                    result.status = "skipped"
+                    return result
+
+                if text is None:
+                    text = (
+                        message
+                        if isinstance(message, str)
+                        else await message(recipient)
+                    )
+                try:
+                    await self.send_conversation(user, text, result)
+                    break
+                except STALE_PEER_ERRORS:
+                    if refresh or result.chunks_sent or not can_refresh:
+                        raise
+                    self.logger.info(f"Stale access hash for {recipient.user_id}")
+
+            result.peer = user
+            result.status = "sent"
+            self.logger.info(f"Message sent to {recipient}")
+        except FloodWaitError as e:
+            self.logger.error(f"Giving up on {recipient} after FloodWaitError: {e}")
+            result.error = str(e)
+        except Exception as e:
+            self.logger.error(f"Error sending message to {recipient}: {str(e)}")
+            result.error = str(e)
+        return result
+
+    async def split_chunks(self, text: str) -> list[str]:
+        """Split each distinct message once; recipients only vary the merge."""
+        split = self._splits.get(text)
+        if split is None:
+            split = asyncio.ensure_future(super().split_chunks(text))
+            self._splits.set(text, split)
+        try:
+            # Shielded, since other deliveries may be waiting on the same split.
+            return list(await asyncio.shield(split))
+        except Exception:
+            if self._splits.get(text) is split:
+                self._splits.pop(text)
+            raise
+
+    async def resolve(self, recipient, refresh: bool = False):
+        if isinstance(recipient, KnownPeer):
+            if not refresh:
+                return InputPeerUser(recipient.user_id, recipient.access_hash)
+            recipient = recipient.fallback
+        return await self.session.rate_limiter.retry(
+            self.session.get_cached_input_entity, recipient
+        )
 
-            except FloodWaitError as e:
-                self.logger.warning(f"FloodWaitError: Waiting for {e.seconds} seconds")
-                await asyncio.sleep(e.seconds)
-            except Exception as e:
-                self.logger.error(f"Error sending message to {recipient}: {str(e)}")
-                raise e
+    async def send_conversation(self, user: InputPeerUser, text: str, result):
+        # Bubbles to one peer never interleave, even across calls.
+        lock = self._peer_locks.setdefault(user.user_id, asyncio.Lock())
+        async with lock:
+            async for chunk in self.simulate_conversation(text, user):
+                sent = await self.session.rate_limiter.call(
+                    self.session.send_message, user, chunk
+                )
+                result.chunks_sent += 1
+                if self.history is not None:
+                    await self.history.record(user.user_id, sent)
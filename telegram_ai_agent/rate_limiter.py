@@ -0,0 +1,135 @@
+import asyncio
+import logging
+
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+from telethon.errors import FloodWaitError
+
+from .clock import Clock
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class RateLimiterStats:
+    acquired: int = 0
+    flood_waits: int = 0
+    retries: int = 0
+    total_wait: float = 0.0
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose rate backs off on ``FloodWaitError`` and recovers.
+
+    Every send through a session takes a token first. A FloodWait blocks the
+    bucket for the requested time and multiplies the rate by ``backoff``; each
+    flood-free second then adds ``recovery`` sends per second back, up to
+    ``max_rate``, so the rate settles just under what Telegram tolerates.
+    ``call`` retries the flooded request itself once the wait is over.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 5,
+        min_rate: float = 0.05,
+        max_rate: float = 5.0,
+        recovery: float = 0.01,
+        backoff: float = 0.5,
+        max_retries: int = 3,
+        max_flood_wait: float = 300.0,
+        clock: Optional[Clock] = None,
+        logger=None,
+    ):
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError("rates must satisfy 0 < min_rate <= rate <= max_rate")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.recovery = recovery
+        self.backoff = backoff
+        self.max_retries = max_retries
+        self.max_flood_wait = max_flood_wait
+        self.clock = clock or Clock()
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = RateLimiterStats()
+        self._tokens = float(burst)
+        self._updated = self.clock.time()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait for a token; callers are served in arrival order."""
+        async with self._lock:
+            while True:
+                now = self.clock.time()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    self.stats.acquired += 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+                self.stats.total_wait += wait
+                await self.clock.sleep(wait, "rate_limit")
+
+    def penalize(self, seconds: float):
+        now = self.clock.time()
+        self._refill(now)
+        self.stats.flood_waits += 1
+        self.rate = max(self.min_rate, self.rate * self.backoff)
+        # One token is left for the retry once the wait is over.
+        self._tokens = 1.0
+        self._blocked_until = max(self._blocked_until, now + seconds)
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """Run ``func`` under the limiter, retrying it after a FloodWait."""
+        return await self._run(func, args, kwargs, take_token=True)
+
+    async def retry(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """Like ``call``, but without spending a token.
+
+        For requests that aren't sends, such as resolving a username or a
+        typing action: they still wait out and report FloodWaits, which block
+        every sender on the session.
+        """
+        return await self._run(func, args, kwargs, take_token=False)
+
+    async def _run(self, func, args, kwargs, take_token: bool):
+        for attempt in range(self.max_retries + 1):
+            if take_token:
+                await self.acquire()
+            else:
+                await self._wait_unblocked()
+            try:
+                return await func(*args, **kwargs)
+            except FloodWaitError as e:
+                self.penalize(e.seconds)
+                if attempt == self.max_retries or e.seconds > self.max_flood_wait:
+                    raise
+                self.stats.retries += 1
+                self.logger.warning(
+                    f"FloodWaitError: retrying in {e.seconds} seconds "
+                    f"at {self.rate:.2f} messages/s"
+                )
+
+    async def _wait_unblocked(self):
+        while (wait := self._blocked_until - self.clock.time()) > 0:
+            self.stats.total_wait += wait
+            await self.clock.sleep(wait, "rate_limit")
+
+    def _refill(self, now: float):
+        elapsed = max(now - max(self._updated, self._blocked_until), 0.0)
+        if elapsed:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self.rate = min(self.max_rate, self.rate + elapsed * self.recovery)
+        self._updated = max(self._updated, now)
@@ -0,0 +1,156 @@
+import hashlib
+import re
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+
+from .cache import TTLCache
+
+
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+    from phi.assistant.assistant import Assistant
+
+
+def normalize_text(text: str) -> str:
+    text = re.sub(r"\s+", " ", text.lower()).strip()
+    return text.strip(" .!?¿¡,;:…")
+
+
+def assistant_scope(assistant: "Assistant") -> str:
+    """Fingerprint of everything that shapes an assistant's answers.
+
+    Changing the instructions, description or model yields a new scope, so
+    answers cached under the old one are never served again and age out.
+    """
+    instructions = assistant.instructions or []
+    if isinstance(instructions, str):
+        instructions = [instructions]
+    fingerprint = "\n".join(
+        [
+            assistant.run_id or "",
+            assistant.description or "",
+            getattr(assistant.llm, "model", None) or "",
+            *instructions,
+        ]
+    )
+    return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    chunks: list[str]
+    vector: Optional[np.ndarray] = None
+
+
+@dataclass
+class ResponseCacheStats:
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    skipped: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.exact_hits + self.semantic_hits
+        lookups = hits + self.misses
+        return hits / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """Reuses replies to questions an assistant has already answered.
+
+    Questions are matched on their normalized text first. With ``embeddings``
+    a miss falls back to the nearest cached question of the same scope whose
+    cosine similarity reaches ``similarity_threshold``. Entries are evicted
+    LRU beyond ``max_size`` and expire after ``ttl`` seconds. Replies are
+    cached already split into bubbles, so a hit skips the chunker as well.
+
+    Only opening questions are cached: ``history`` must hold no earlier
+    assistant message, since a reply to "yes" or "and the second one?"
+    depends on the conversation. Questions shorter than
+    ``min_question_chars`` are never cached either.
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional["Embeddings"] = None,
+        similarity_threshold: float = 0.95,
+        max_size: int = 1000,
+        ttl: Optional[float] = 86400.0,
+        min_question_chars: int = 12,
+    ):
+        self.embeddings = embeddings
+        self.min_question_chars = min_question_chars
+        self.similarity_threshold = similarity_threshold
+        self.stats = ResponseCacheStats()
+        self._entries = TTLCache(max_size=max_size, ttl=ttl)
+        self._vectors = TTLCache(max_size=256, ttl=ttl)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def cacheable(self, text: str, history: list[dict[str, Any]] = ()) -> bool:
+        if len(normalize_text(text)) < self.min_question_chars:
+            return False
+        return not any(message["role"] == "assistant" for message in history)
+
+    async def lookup(
+        self, scope: str, text: str, history: list[dict[str, Any]] = ()
+    ) -> Optional[list[str]]:
+        if not self.cacheable(text, history):
+            self.stats.skipped += 1
+            return None
+
+        key = (scope, normalize_text(text))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.stats.exact_hits += 1
+            return list(entry.chunks)
+
+        if self.embeddings is not None:
+            nearest_key = self._nearest(scope, await self._embed(key))
+            if nearest_key is not None:
+                self.stats.semantic_hits += 1
+                return list(self._entries.get(nearest_key).chunks)
+
+        self.stats.misses += 1
+        return None
+
+    async def store(
+        self,
+        scope: str,
+        text: str,
+        chunks: list[str],
+        history: list[dict[str, Any]] = (),
+    ):
+        if not chunks or not self.cacheable(text, history):
+            return
+        key = (scope, normalize_text(text))
+        vector = await self._embed(key) if self.embeddings is not None else None
+        self._entries.set(key, CachedResponse(chunks=list(chunks), vector=vector))
+
+    async def _embed(self, key: tuple[str, str]) -> np.ndarray:
+        vector = self._vectors.get(key)
+        if vector is None:
+            vector = np.asarray(await self.embeddings.aembed_query(key[1]))
+            vector = vector / (np.linalg.norm(vector) or 1.0)
+            self._vectors.set(key, vector)
+        return vector
+
+    def _nearest(self, scope: str, vector: np.ndarray) -> Optional[tuple[str, str]]:
+        candidates = [
+            (key, entry.vector)
+            for key, entry in self._entries.items()
+            if key[0] == scope and entry.vector is not None
+        ]
+        if not candidates:
+            return None
+
+        similarities = np.stack([candidate for _, candidate in candidates]) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        return candidates[best][0]
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import math
+import time
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from .clock import Clock
+
+
+@dataclass
+class SchedulerStats:
+    scheduled: int = 0
+    fired: int = 0
+    cancelled: int = 0
+    typing_skipped: int = 0
+    total_lag: float = 0.0
+    max_lag: float = 0.0
+
+    @property
+    def average_lag(self) -> float:
+        return self.total_lag / self.fired if self.fired else 0.0
+
+
+class TimerHandle:
+    __slots__ = ("deadline", "due", "callback", "args", "done", "_wheel")
+
+    def __init__(self, wheel, deadline, due, callback, args):
+        self.deadline = deadline
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.done = False
+        self._wheel = wheel
+
+    def cancel(self):
+        if not self.done:
+            self.done = True
+            self._wheel._discard(self)
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class TimerWheel:
+    """Hierarchical timing wheel that owns every simulated delay of an agent.
+
+    Read delays, typing bursts and think time across all chats are timers in
+    one wheel driven by a single task that wakes once per ``tick``, instead of
+    one event loop timer per sleeping coroutine. Level 0 has ``slots`` buckets
+    of one tick each, and every further level covers ``slots`` times the span
+    of the one below; its buckets are cascaded down as the wheel turns, so
+    scheduling and firing are O(1) however many timers are pending.
+
+    ``max_typing`` caps how many chats may show a typing indicator at once,
+    see ``typing_slot``. ``stats`` records how late timers fire (lag).
+
+    The wheel itself runs on real time; with a virtual ``clock`` ``sleep``
+    goes straight to the clock instead.
+    """
+
+    def __init__(
+        self,
+        tick: float = 0.01,
+        slots: int = 256,
+        levels: int = 4,
+        max_typing: Optional[int] = None,
+        clock: Optional[Clock] = None,
+        logger=None,
+    ):
+        if tick <= 0:
+            raise ValueError("tick must be positive")
+
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.max_typing = max_typing
+        self.clock = clock or Clock()
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = SchedulerStats()
+        self.typing_active = 0
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._spans = [slots**level for level in range(levels)]
+        self._current = self._now_tick()
+        self._pending = 0
+        self._driver: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def lag(self) -> float:
+        """How far the wheel currently trails the clock, in seconds."""
+        if not self._pending:
+            return 0.0
+        return max(0.0, time.monotonic() - (self._current + 1) * self.tick)
+
+    def call_later(
+        self, delay: float, callback: Callable[..., Any], *args
+    ) -> TimerHandle:
+        if not self._pending:
+            # Nothing is waiting, so skip the idle ticks instead of replaying them.
+            self._current = self._now_tick()
+        deadline = time.monotonic() + max(delay, 0.0)
+        due = max(math.ceil(deadline / self.tick), self._current + 1)
+        handle = TimerHandle(self, deadline, due, callback, args)
+        self._insert(handle)
+        self._pending += 1
+        self.stats.scheduled += 1
+        self._ensure_driver()
+        return handle
+
+    async def sleep(self, delay: float, label: str = ""):
+        if self.clock.virtual:
+            await self.clock.sleep(delay, label)
+            return
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        handle = self.call_later(delay, _wake, future)
+        try:
+            await future
+        finally:
+            handle.cancel()
+
+    @contextmanager
+    def typing_slot(self) -> Iterator[bool]:
+        """Yield whether this chat may show a typing indicator right now.
+
+        Chats over the ``max_typing`` cap still wait out their typing time,
+        they just don't send the indicator.
+        """
+        allowed = self.max_typing is None or self.typing_active < self.max_typing
+        if allowed:
+            self.typing_active += 1
+        else:
+            self.stats.typing_skipped += 1
+        try:
+            yield allowed
+        finally:
+            if allowed:
+                self.typing_active -= 1
+
+    async def stop(self):
+        if self._driver:
+            self._driver.cancel()
+            await asyncio.gather(self._driver, return_exceptions=True)
+            self._driver = None
+
+    def _now_tick(self) -> int:
+        return int(time.monotonic() / self.tick)
+
+    def _insert(self, handle: TimerHandle):
+        delta = handle.due - self._current
+        for level in range(self.levels):
+            if level == self.levels - 1 or delta < self._spans[level] * self.slots:
+                due = handle.due
+                if level == self.levels - 1:
+                    # Beyond the horizon: park in the furthest bucket and re-cascade.
+                    due = min(due, self._current + self._spans[level] * self.slots - 1)
+                slot = (due // self._spans[level]) % self.slots
+                self._wheels[level][slot].append(handle)
+                return
+
+    def _discard(self, handle: TimerHandle):
+        # The handle stays in its bucket and is skipped when the bucket is reached.
+        self._pending -= 1
+        self.stats.cancelled += 1
+
+    def _ensure_driver(self):
+        if self._driver is None or self._driver.done():
+            self._wakeup = asyncio.Event()
+            self._driver = asyncio.create_task(self._run())
+        elif not self._wakeup.is_set():
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            delay = (self._current + 1) * self.tick - time.monotonic()
+            await asyncio.sleep(max(delay, 0))
+            try:
+                self._advance(self._now_tick())
+            except Exception as e:
+                self.logger.error(f"Error firing scheduled actions: {str(e)}")
+
+    def _advance(self, target: int):
+        while self._current < target and self._pending:
+            self._current += 1
+            tick = self._current
+            for level in range(self.levels - 1, 0, -1):
+                if tick % self._spans[level] == 0:
+                    slot = (tick // self._spans[level]) % self.slots
+                    bucket, self._wheels[level][slot] = self._wheels[level][slot], []
+                    for handle in bucket:
+                        if not handle.done:
+                            self._insert(handle)
+
+            slot = tick % self.slots
+            bucket, self._wheels[0][slot] = self._wheels[0][slot], []
+            if bucket:
+                self._fire(bucket)
+        if not self._pending:
+            self._current = max(self._current, target)
+
+    def _fire(self, bucket: list[TimerHandle]):
+        now = time.monotonic()
+        for handle in bucket:
+            if handle.done:
+                continue
+            handle.done = True
+            self._pending -= 1
+            self.stats.fired += 1
+            lag = max(now - handle.deadline, 0.0)
+            self.stats.total_lag += lag
+            self.stats.max_lag = max(self.stats.max_lag, lag)
+            try:
+                handle.callback(*handle.args)
+            except Exception as e:
+                self.logger.error(f"Error in scheduled action: {str(e)}")
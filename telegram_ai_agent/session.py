@@ -6,7 +6,10 @@ from typing import Callable, Optional
 from telethon import TelegramClient as TelethonClient
 from telethon.errors import SessionPasswordNeededError
 
+from .cache import TTLCache
 from .config import TelegramConfig
+from .rate_limiter import AdaptiveRateLimiter
+from .typing_indicator import TypingIndicatorManager
 
 
 class TelegramSession(TelethonClient):
@@ -36,6 +39,24 @@ class TelegramSession(TelethonClient):
         self.config = config
         self.code_callback = code_callback
         self.twofa_password_callback = twofa_password_callback
+        self.entity_cache = TTLCache(
+            max_size=config.entity_cache_size, ttl=config.entity_cache_ttl
+        )
+        # Shared by everything sending through this session.
+        self.rate_limiter = AdaptiveRateLimiter(
+            rate=config.send_rate,
+            burst=config.send_burst,
+            min_rate=config.min_send_rate,
+            max_rate=config.max_send_rate,
+            recovery=config.send_rate_recovery,
+            max_retries=config.flood_wait_retries,
+            max_flood_wait=config.max_flood_wait,
+            clock=config.clock,
+            logger=self.logger,
+        )
+        self.typing_indicator = TypingIndicatorManager(
+            self, clock=config.clock, logger=self.logger, rate_limiter=self.rate_limiter
+        )
 
     def verify_config(self, config: TelegramConfig):
         if not config.session_name:
@@ -59,6 +80,24 @@ class TelegramSession(TelethonClient):
         if not config.phone_number.startswith("+"):
             raise ValueError("phone_number must start with '+'")
 
+    async def get_sender_entity(self, event):
+        """Sender of ``event``, resolved over the network at most once per TTL."""
+        key = ("sender", event.sender_id)
+        sender = self.entity_cache.get(key)
+        if sender is None:
+            sender = await event.get_sender()
+            self.entity_cache.set(key, sender)
+        return sender
+
+    async def get_cached_input_entity(self, peer):
+        """``get_input_entity`` for usernames, phones and ids, cached per session."""
+        key = ("input", peer.lstrip("@").lower() if isinstance(peer, str) else peer)
+        input_entity = self.entity_cache.get(key)
+        if input_entity is None:
+            input_entity = await self.get_input_entity(peer)
+            self.entity_cache.set(key, input_entity)
+        return input_entity
+
     async def __aenter__(self):
         await self.start()
         return self
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+
+from functools import cache, lru_cache
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-4o"
+DEFAULT_CONTEXT_WINDOW = 8192
+MESSAGE_OVERHEAD_TOKENS = 4
+
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+}
+
+
+@cache
+def get_encoding(model: str):
+    """Return the tiktoken encoding for ``model``, or None if it can't be loaded.
+
+    tiktoken downloads its BPE files on first use, so offline hosts fall back to
+    a character based estimate instead of failing every call.
+    """
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable for {model}, estimating tokens: {e}")
+        return None
+
+
+async def load_encoding(model: str = DEFAULT_MODEL):
+    """``get_encoding`` off the event loop, since the first call may download."""
+    return await asyncio.to_thread(get_encoding, model)
+
+
+@cache
+def encoding_name(model: str) -> str:
+    """Name of ``model``'s encoding; models sharing one count tokens alike."""
+    encoding = get_encoding(model)
+    return encoding.name if encoding is not None else "estimate"
+
+
+def message_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """Tokens a chat message with ``text`` content adds to a prompt."""
+    encoding = get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1 + MESSAGE_OVERHEAD_TOKENS
+    return len(encoding.encode(text)) + MESSAGE_OVERHEAD_TOKENS
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """``message_tokens`` cached by text, for prompts that repeat verbatim."""
+    return message_tokens(text, model)
+
+
+def context_window(model: Optional[str]) -> int:
+    if not model:
+        return DEFAULT_CONTEXT_WINDOW
+    for prefix in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_CONTEXT_WINDOWS[prefix]
+    return DEFAULT_CONTEXT_WINDOW
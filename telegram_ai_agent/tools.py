@@ -81,6 +81,7 @@ class TelegramTools:
                         chat.first_name,
                         chat.last_name,
                         chat.phone,
+                        chat.access_hash,
                     )
                 ]
             elif isinstance(chat, (Chat, Channel)):
@@ -98,7 +99,14 @@ class TelegramTools:
             with open(output_path, "w", newline="", encoding="utf-8") as file:
                 writer = csv.DictWriter(
                     file,
-                    fieldnames=["id", "username", "first_name", "last_name", "phone"],
+                    fieldnames=[
+                        "id",
+                        "username",
+                        "first_name",
+                        "last_name",
+                        "phone",
+                        "access_hash",
+                    ],
                 )
                 writer.writeheader()
                 for member in members:
@@ -109,6 +117,7 @@ class TelegramTools:
                             "first_name": member[2],
                             "last_name": member[3],
                             "phone": member[4],
+                            "access_hash": member[5],
                         }
                     )
 
@@ -122,9 +131,18 @@ class TelegramTools:
             raise e from e
 
     async def advanced_search_participants(self, chat, include_kick_ban=False):
+        # Members are (id, username, first_name, last_name, phone, access_hash);
+        # the access hash is only valid for the account that fetched it.
         if isinstance(chat, User):
             return [
-                (chat.id, chat.username, chat.first_name, chat.last_name, chat.phone)
+                (
+                    chat.id,
+                    chat.username,
+                    chat.first_name,
+                    chat.last_name,
+                    chat.phone,
+                    chat.access_hash,
+                )
             ]
 
         self.logger.info("Performing advanced search for participants")
@@ -156,6 +174,7 @@ class TelegramTools:
                             user.first_name,
                             user.last_name,
                             user.phone,
+                            user.access_hash,
                         )
                     )
                 offset += len(participants.participants)
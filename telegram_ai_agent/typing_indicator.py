@@ -0,0 +1,93 @@
+import logging
+
+from dataclasses import dataclass
+from typing import Optional
+
+from telethon import utils
+from telethon.tl.functions.messages import SetTypingRequest
+from telethon.tl.types import SendMessageCancelAction, SendMessageTypingAction
+
+from .cache import TTLCache
+from .clock import Clock
+from .rate_limiter import AdaptiveRateLimiter
+
+
+# Telegram clients show a typing action for about 6 seconds and official apps
+# repeat it every 5, so the indicator is refreshed one second before it lapses.
+TYPING_ACTION_LIFETIME = 6.0
+TYPING_REFRESH_MARGIN = 1.0
+
+
+@dataclass
+class TypingIndicatorStats:
+    requests: int = 0
+    sent: int = 0
+    cancelled: int = 0
+
+    @property
+    def saved(self) -> int:
+        return self.requests - self.sent
+
+
+class TypingIndicatorManager:
+    """Sends ``SetTypingRequest`` only when a peer's indicator is about to lapse.
+
+    ``ensure`` is called whenever a chat should look like it's typing and
+    returns how long the indicator stays visible without another request.
+    ``discard`` forgets a peer whose indicator ends because we're sending a
+    message, and ``cancel`` explicitly clears one that won't be followed by a
+    message. ``stats.saved`` counts the requests that were skipped.
+    """
+
+    def __init__(
+        self,
+        session,
+        max_peers: int = 10000,
+        clock: Optional[Clock] = None,
+        logger=None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    ):
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.clock = clock or Clock()
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = TypingIndicatorStats()
+        # Expiry is judged on ``clock``, the cache only bounds memory.
+        self._expires = TTLCache(max_size=max_peers)
+
+    async def ensure(self, peer) -> float:
+        self.stats.requests += 1
+        key = self._key(peer)
+        now = self.clock.time()
+        expires_at = self._expires.get(key)
+        if expires_at is None or expires_at - now <= TYPING_REFRESH_MARGIN:
+            request = SetTypingRequest(peer=peer, action=SendMessageTypingAction())
+            if self.rate_limiter is not None:
+                await self.rate_limiter.retry(self.session, request)
+            else:
+                await self.session(request)
+            self.stats.sent += 1
+            expires_at = now + TYPING_ACTION_LIFETIME
+            self._expires.set(key, expires_at)
+        return expires_at - now - TYPING_REFRESH_MARGIN
+
+    def discard(self, peer):
+        self._expires.pop(self._key(peer))
+
+    async def cancel(self, peer):
+        expires_at = self._expires.pop(self._key(peer))
+        if expires_at is None or expires_at <= self.clock.time():
+            return
+        try:
+            await self.session(
+                SetTypingRequest(peer=peer, action=SendMessageCancelAction())
+            )
+            self.stats.cancelled += 1
+        except Exception as e:
+            self.logger.warning(f"Failed to cancel typing indicator: {str(e)}")
+
+    def _key(self, peer):
+        try:
+            return utils.get_peer_id(peer)
+        except (TypeError, ValueError):
+            return getattr(peer, "id", None) or id(peer)
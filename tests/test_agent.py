@@ -2,9 +2,11 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from langchain_experimental.text_splitter import SemanticChunker
 from phi.llm.openai.chat import OpenAIChat
 
 from telegram_ai_agent.agent import TelegramAIAgent
+from telegram_ai_agent.chunking import SentenceChunker
 from telegram_ai_agent.config import TelegramConfig
 
 
@@ -100,7 +102,7 @@ async def test_agent_send_messages(
     await agent.send_messages(recipients, message)
 
     # Verify that outbound.send_messages was called with correct arguments
-    agent.outbound.send_messages.assert_called_once_with(recipients, message, 0)
+    agent.outbound.send_messages.assert_called_once_with(recipients, message, 0, None)
 
 
 @pytest.mark.asyncio
@@ -137,3 +139,22 @@ async def test_agent_run(mock_assistant, mock_config, mock_logger, mock_session)
     agent.start.assert_called_once()
     agent.process_incoming_messages.assert_called_once()
     mock_session.run_until_disconnected.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_agent_uses_local_chunker_by_default(
+    mock_assistant, mock_config, mock_logger, mock_session
+):
+    agent = TelegramAIAgent(
+        mock_assistant, mock_config, logger=mock_logger, session=mock_session
+    )
+    assert isinstance(agent.text_splitter, SentenceChunker)
+
+    mock_config.chunking_strategy = "semantic"
+    agent = TelegramAIAgent(
+        mock_assistant, mock_config, logger=mock_logger, session=mock_session
+    )
+    assert "embeddings" not in agent.__dict__
+    assert isinstance(agent.text_splitter, SemanticChunker)
+    assert agent.inbound.text_splitter.factory() is agent.text_splitter
+    assert agent.outbound.text_splitter is agent.inbound.text_splitter
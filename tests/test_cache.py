@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from telegram_ai_agent.cache import TTLCache
+from telegram_ai_agent.config import TelegramConfig
+from telegram_ai_agent.session import TelegramSession
+
+
+def test_ttl_cache_tracks_hits_and_evicts_least_recently_used():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(ttl=10)
+    with patch("telegram_ai_agent.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("telegram_ai_agent.cache.time.monotonic", return_value=105.0):
+        assert cache.get("a") == 1
+    with patch("telegram_ai_agent.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_session_resolves_entities_once(tmp_path):
+    config = TelegramConfig(
+        session_name=str(tmp_path / "session"),
+        api_id=12345,
+        api_hash="test_hash",
+        phone_number="+1234567890",
+    )
+    session = TelegramSession(config)
+    session.get_input_entity = AsyncMock(return_value="input_peer")
+    event = SimpleNamespace(sender_id=7, get_sender=AsyncMock(return_value="user"))
+
+    for _ in range(3):
+        assert await session.get_sender_entity(event) == "user"
+        assert await session.get_cached_input_entity("@Alice") == "input_peer"
+    assert await session.get_cached_input_entity("alice") == "input_peer"
+
+    event.get_sender.assert_awaited_once()
+    session.get_input_entity.assert_awaited_once_with("@Alice")
+    assert session.entity_cache.hits == 5
+    assert session.entity_cache.misses == 2
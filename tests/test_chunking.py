@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from telegram_ai_agent.chunking import (
+    IncrementalChunker,
+    SentenceChunker,
+    merge_shortest,
+    split_oversized,
+)
+from telegram_ai_agent.config import TelegramConfig
+from telegram_ai_agent.messages_handler import MessagesHandler
+
+
+def test_sentence_chunker_cuts_at_sentences_and_paragraphs():
+    chunker = SentenceChunker(min_chunk_chars=20)
+    text = "Sure! Our plan costs $10 a month. It includes support.\n\nWant a demo?"
+
+    assert chunker.split_text(text) == [
+        "Sure! Our plan costs $10 a month.",
+        "It includes support.",
+        "Want a demo?",
+    ]
+    assert chunker.split_text("") == []
+
+
+def test_incremental_chunker_emits_complete_sentences_early():
+    chunker = IncrementalChunker(min_chunk_chars=20, max_chunks=3)
+
+    assert chunker.feed("Hello there, nice to") == []
+    assert chunker.feed(" meet you. How") == ["Hello there, nice to meet you."]
+    assert chunker.feed(" are you?") == []
+    assert chunker.flush() == ["How are you?"]
+
+
+def test_incremental_chunker_splits_on_paragraphs_and_caps_bubbles():
+    chunker = IncrementalChunker(min_chunk_chars=1000, max_chunks=2)
+
+    chunks = chunker.feed("Hi!\n\nFirst paragraph.\n\nSecond paragraph.")
+    chunks += chunker.flush()
+
+    assert chunks == ["Hi!", "First paragraph.\n\nSecond paragraph."]
+
+
+@pytest.mark.asyncio
+async def test_incremental_chunker_splits_async_stream():
+    async def deltas():
+        for token in ["One sentence here. ", "Another ", "one."]:
+            yield token
+
+    chunker = IncrementalChunker(min_chunk_chars=5, max_chunks=3)
+    chunks = [chunk async for chunk in chunker.split_stream(deltas())]
+
+    assert chunks == ["One sentence here.", "Another one."]
+
+
+def test_merge_shortest_merges_into_previous_neighbour():
+    chunks = ["Hello there.", "Hi.", "How are you today?", "Ok."]
+
+    assert merge_shortest(chunks, 2) == [
+        "Hello there. Hi.",
+        "How are you today? Ok.",
+    ]
+    assert merge_shortest(["A.", "Longer one."], 1) == ["A. Longer one."]
+    assert merge_shortest([], 1) == []
+
+
+def test_merge_shortest_respects_max_length():
+    chunks = ["a" * 8, "b", "c" * 8]
+
+    assert merge_shortest(chunks, 1, max_length=10) == ["a" * 8 + " b", "c" * 8]
+
+
+def test_split_oversized_cuts_at_whitespace():
+    assert split_oversized(["one two three", "four"], max_length=8) == [
+        "one two",
+        "three",
+        "four",
+    ]
+    assert split_oversized(["abcdefghij"], max_length=4) == ["abcd", "efgh", "ij"]
+
+
+@pytest.mark.asyncio
+async def test_balance_chunks_handles_fewer_chunks_than_min_messages():
+    config = TelegramConfig(
+        session_name="test",
+        api_id=1,
+        api_hash="test",
+        phone_number="+10000000000",
+        min_messages=3,
+        max_messages=5,
+    )
+    handler = MessagesHandler(MagicMock(), config, SentenceChunker(min_chunk_chars=1))
+
+    assert await handler.balance_chunks("Hi. There.") == ["Hi.", "There."]
+    assert await handler.balance_chunks("x" * 5000) == ["x" * 4096, "x" * 904]
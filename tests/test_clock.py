@@ -0,0 +1,24 @@
+import asyncio
+
+import pytest
+
+from telegram_ai_agent.clock import TimelineEntry, VirtualClock
+
+
+@pytest.mark.asyncio
+async def test_virtual_clock_advances_instantly_per_task():
+    clock = VirtualClock()
+
+    async def conversation(delays):
+        for delay in delays:
+            await clock.sleep(delay, "typing")
+        return clock.time()
+
+    ends = await asyncio.wait_for(
+        asyncio.gather(conversation([30, 5]), conversation([1])), timeout=1
+    )
+
+    assert ends == [35, 1]
+    assert clock.time() == 0
+    assert clock.elapsed == 36
+    assert TimelineEntry(30, 5, "typing") in clock.timeline
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from telegram_ai_agent.dispatcher import InboundDispatcher
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_serializes_messages_per_chat():
+    handled = []
+
+    async def handler(chat_id, items):
+        handled.append((chat_id, items, "start"))
+        await asyncio.sleep(0.01)
+        handled.append((chat_id, items, "end"))
+
+    dispatcher = InboundDispatcher(handler, max_concurrency=5)
+    dispatcher.submit(1, "a")
+    await asyncio.sleep(0)
+    dispatcher.submit(1, "b")
+    assert dispatcher.queue_depth(1) == 1
+
+    while dispatcher.active_chats:
+        await asyncio.sleep(0.01)
+
+    assert handled == [
+        (1, ["a"], "start"),
+        (1, ["a"], "end"),
+        (1, ["b"], "start"),
+        (1, ["b"], "end"),
+    ]
+    assert dispatcher.stats.processed == 2
+    assert dispatcher.stats.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_caps_global_concurrency():
+    active = 0
+    peak = 0
+
+    async def handler(chat_id, items):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    dispatcher = InboundDispatcher(handler, max_concurrency=2)
+    for chat_id in range(6):
+        dispatcher.submit(chat_id, "hello")
+
+    while dispatcher.active_chats:
+        await asyncio.sleep(0.01)
+
+    assert peak == 2
+    assert dispatcher.stats.processed == 6
+    assert dispatcher.stats.max_wait_time > 0
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_counts_failures_and_keeps_going():
+    async def handler(chat_id, items):
+        if items == ["bad"]:
+            raise RuntimeError("boom")
+
+    dispatcher = InboundDispatcher(handler)
+    dispatcher.submit(1, "bad")
+    await asyncio.sleep(0)
+    dispatcher.submit(1, "good")
+
+    while dispatcher.active_chats:
+        await asyncio.sleep(0.01)
+
+    assert dispatcher.stats.failed == 1
+    assert dispatcher.stats.processed == 1
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_coalesces_bursts_within_debounce_window():
+    batches = []
+
+    async def handler(chat_id, items):
+        batches.append(items)
+
+    dispatcher = InboundDispatcher(handler, debounce_window=0.05)
+    for text in ("hi", "are you", "there?"):
+        dispatcher.submit(1, text)
+        await asyncio.sleep(0.01)
+
+    while dispatcher.active_chats:
+        await asyncio.sleep(0.01)
+
+    assert batches == [["hi", "are you", "there?"]]
+    assert dispatcher.stats.batches == 1
+    assert dispatcher.stats.average_batch_size == 3
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_debounce_respects_max_wait():
+    batches = []
+
+    async def handler(chat_id, items):
+        batches.append(items)
+
+    dispatcher = InboundDispatcher(
+        handler, debounce_window=0.05, debounce_max_wait=0.05
+    )
+    for i in range(6):
+        dispatcher.submit(1, i)
+        await asyncio.sleep(0.02)
+
+    while dispatcher.active_chats:
+        await asyncio.sleep(0.01)
+
+    assert len(batches) > 1
+    assert [i for batch in batches for i in batch] == list(range(6))
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_supersedes_in_flight_batch():
+    calls = []
+    started = asyncio.Event()
+
+    async def handler(chat_id, items):
+        calls.append(items)
+        started.set()
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+
+    dispatcher = InboundDispatcher(handler, supersede=True)
+    dispatcher.submit(1, "a")
+    await started.wait()
+    dispatcher.submit(1, "b")
+
+    while dispatcher.active_chats:
+        await asyncio.sleep(0.01)
+
+    assert calls == [["a"], ["a", "b"]]
+    assert dispatcher.stats.superseded == 1
+    assert dispatcher.stats.processed == 2
+    assert dispatcher.stats.queued == 0
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from langchain_core.embeddings import Embeddings
+
+from telegram_ai_agent.embeddings import BatchingEmbeddings, CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    model = "test-embedding"
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return [float(len(text)), 2.0]
+
+
+def test_cached_embeddings_only_embeds_unseen_texts():
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner)
+
+    first = embeddings.embed_documents(["Hello.", "Hi.", "Hello."])
+    second = embeddings.embed_documents(["Hi.", "Bye."])
+
+    assert first == [[6.0, 1.0], [3.0, 1.0], [6.0, 1.0]]
+    assert second == [[3.0, 1.0], [4.0, 1.0]]
+    assert inner.calls == [["Hello.", "Hi."], ["Bye."]]
+    assert embeddings.stats.memory_hits == 1
+    assert embeddings.stats.misses == 4
+    assert embeddings.stats.hit_ratio == 0.2
+
+
+def test_cached_embeddings_keeps_queries_apart_from_documents():
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner)
+
+    assert embeddings.embed_documents(["Hello."]) == [[6.0, 1.0]]
+    assert embeddings.embed_query("Hello.") == [6.0, 2.0]
+    assert embeddings.embed_query("Hello.") == [6.0, 2.0]
+    assert len(inner.calls) == 2
+
+
+def test_cached_embeddings_share_disk_tier(tmp_path):
+    db_path = str(tmp_path / "embeddings.db")
+    CachedEmbeddings(CountingEmbeddings(), db_path=db_path).embed_documents(
+        ["Hello.", "Hi."]
+    )
+
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner, db_path=db_path)
+
+    assert embeddings.embed_documents(["Hi.", "Hello.", "Bye."]) == [
+        [3.0, 1.0],
+        [6.0, 1.0],
+        [4.0, 1.0],
+    ]
+    assert inner.calls == [["Bye."]]
+    assert embeddings.stats.disk_hits == 2
+    assert embeddings.embed_documents(["Hi."]) == [[3.0, 1.0]]
+    assert embeddings.stats.memory_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_batching_embeddings_merges_concurrent_requests():
+    inner = CountingEmbeddings()
+    embeddings = BatchingEmbeddings(inner, max_batch_size=4, max_delay=0.01)
+
+    results = await asyncio.gather(
+        embeddings.aembed_documents(["a", "bb"]),
+        embeddings.aembed_documents(["ccc"]),
+        asyncio.to_thread(embeddings.embed_documents, ["dddd", "eeeee"]),
+    )
+
+    assert results == [
+        [[1.0, 1.0], [2.0, 1.0]],
+        [[3.0, 1.0]],
+        [[4.0, 1.0], [5.0, 1.0]],
+    ]
+    assert sorted(len(call) for call in inner.calls) == [1, 4]
+    assert embeddings.stats.requests == 3
+    assert embeddings.stats.calls == 2
@@ -0,0 +1,52 @@
+from dataclasses import replace
+from types import SimpleNamespace
+
+from telegram_ai_agent.filters import InboundFilter
+
+
+def make_event(text="hello", sender_id=1, **overrides):
+    fields = {
+        "out": False,
+        "is_private": True,
+        "sender_id": sender_id,
+        "sender": SimpleNamespace(bot=False),
+        "text": text,
+        "message": SimpleNamespace(action=None, via_bot_id=None),
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def test_inbound_filter_accepts_plain_private_messages():
+    assert InboundFilter().check(make_event()) is None
+
+
+def test_inbound_filter_rejects_junk_traffic():
+    inbound_filter = InboundFilter(blocked_ids={9}, max_length=10)
+
+    assert inbound_filter.check(make_event(is_private=False)) == "not_private"
+    assert inbound_filter.check(make_event(sender=SimpleNamespace(bot=True))) == "bot"
+    assert inbound_filter.check(make_event(sender_id=9)) == "blocked"
+    assert inbound_filter.check(make_event(text="")) == "too_short"
+    assert inbound_filter.check(make_event(text="x" * 11)) == "too_long"
+    assert (
+        inbound_filter.check(
+            make_event(message=SimpleNamespace(action="joined", via_bot_id=None))
+        )
+        == "service"
+    )
+    assert sum(inbound_filter.rejected.values()) == 6
+
+
+def test_inbound_filter_allowlist_and_rate_limit():
+    inbound_filter = InboundFilter(allowed_ids={1, 2}, rate_limit=2)
+
+    assert inbound_filter.check(make_event(sender_id=3)) == "not_allowed"
+    assert inbound_filter.check(make_event(sender_id=1)) is None
+    assert inbound_filter.check(make_event(sender_id=1)) is None
+    assert inbound_filter.check(make_event(sender_id=1)) == "rate_limited"
+    assert inbound_filter.check(make_event(sender_id=2)) is None
+
+    fresh = replace(inbound_filter)
+    assert fresh.check(make_event(sender_id=1)) is None
+    assert not fresh.rejected
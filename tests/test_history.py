@@ -0,0 +1,153 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from telegram_ai_agent import history as history_module
+from telegram_ai_agent.history import ChatHistoryCache, ConversationStore
+from telegram_ai_agent.tokens import count_tokens
+
+
+def make_message(message_id, text, out=False):
+    return SimpleNamespace(id=message_id, text=text, out=out)
+
+
+def make_session(messages):
+    session = MagicMock()
+
+    async def iter_messages(chat_id, limit=None, min_id=0):
+        # Telethon yields newest first
+        for message in sorted(messages, key=lambda m: m.id, reverse=True)[:limit]:
+            if message.id > min_id:
+                yield message
+
+    session.iter_messages = MagicMock(side_effect=iter_messages)
+    return session
+
+
+class MemoryStore(ConversationStore):
+    def __init__(self):
+        self.chats = {}
+
+    async def append(self, chat_id, entries):
+        log = self.chats.setdefault(chat_id, {})
+        for entry in entries:
+            log.setdefault(entry.message_id, entry)
+
+    async def last_messages(self, chat_id, limit, token_budget=None):
+        log = self.chats.get(chat_id, {})
+        return [log[key] for key in sorted(log)][-limit:]
+
+
+@pytest.mark.asyncio
+async def test_history_cache_seeds_once_and_tracks_new_messages():
+    session = make_session(
+        [make_message(1, "hello"), make_message(2, "hi there", out=True)]
+    )
+    cache = ChatHistoryCache(session, limit=10)
+
+    assert await cache.get(42) == [
+        {"role": "user", "content": "hello"},
+        {"role": "assistant", "content": "hi there"},
+    ]
+
+    await cache.record(42, make_message(3, "how are you?"))
+    await cache.record(42, make_message(4, "great", out=True))
+    history = await cache.get(42)
+
+    assert session.iter_messages.call_count == 1
+    assert [m["content"] for m in history] == [
+        "hello",
+        "hi there",
+        "how are you?",
+        "great",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_history_cache_refreshes_incrementally():
+    messages = [make_message(1, "hello")]
+    session = make_session(messages)
+    cache = ChatHistoryCache(session, limit=10, refresh_interval=0)
+
+    await cache.get(42)
+    messages.append(make_message(2, "sent from phone", out=True))
+    history = await cache.get(42)
+
+    assert session.iter_messages.call_args.kwargs["min_id"] == 1
+    assert [m["content"] for m in history] == ["hello", "sent from phone"]
+
+
+@pytest.mark.asyncio
+async def test_history_cache_enforces_limits():
+    session = make_session([make_message(i, f"m{i}") for i in range(1, 4)])
+    cache = ChatHistoryCache(session, limit=2, max_chats=2)
+
+    await cache.get(1)
+    await cache.record(1, make_message(4, "m4"))
+    assert [m["content"] for m in await cache.get(1)] == ["m3", "m4"]
+
+    await cache.get(2)
+    await cache.get(3)
+    assert 1 not in cache
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_history_cache_persists_to_store_and_cold_starts_from_it():
+    store = MemoryStore()
+    session = make_session([make_message(1, "hello"), make_message(2, "hi", out=True)])
+    cache = ChatHistoryCache(session, limit=10, store=store)
+
+    await cache.get(42)
+    await cache.record(42, make_message(3, "how are you?"))
+    assert sorted(store.chats[42]) == [1, 2, 3]
+
+    restarted_session = make_session([])
+    restarted = ChatHistoryCache(restarted_session, limit=10, store=store)
+    history = await restarted.get(42)
+
+    restarted_session.iter_messages.assert_not_called()
+    assert [m["content"] for m in history] == ["hello", "hi", "how are you?"]
+
+
+@pytest.mark.asyncio
+async def test_history_cache_fits_token_budget_from_newest():
+    session = make_session([make_message(i, "word " * i * 10) for i in range(1, 6)])
+    cache = ChatHistoryCache(session, limit=10)
+
+    full = await cache.get(42)
+    counts = [count_tokens(m["content"]) for m in full]
+    history = await cache.get(42, token_budget=counts[-1] + counts[-2])
+
+    assert history == full[-2:]
+    assert await cache.get(42, token_budget=0) == []
+
+
+@pytest.mark.asyncio
+async def test_history_cache_counts_tokens_once_per_encoding():
+    counted = []
+
+    def fake_encoding_name(model):
+        return "cl100k_base" if model == "gpt-4" else "o200k_base"
+
+    def fake_message_tokens(text, model="gpt-4o"):
+        counted.append(model)
+        return count_tokens(text) * (2 if model == "gpt-4" else 1)
+
+    with (
+        patch.object(history_module, "encoding_name", fake_encoding_name),
+        patch.object(history_module, "message_tokens", fake_message_tokens),
+    ):
+        session = make_session([make_message(i, "word " * 10) for i in range(1, 6)])
+        cache = ChatHistoryCache(session, limit=10)
+        budget = sum(count_tokens(m["content"]) for m in await cache.get(42))
+
+        # gpt-4o-mini shares gpt-4o's encoding, so it reuses the stored counts.
+        assert len(await cache.get(42, token_budget=budget, model="gpt-4o-mini")) == 5
+        assert len(await cache.get(42, token_budget=budget, model="gpt-4")) == 2
+        await cache.get(42, token_budget=budget, model="gpt-4")
+
+    assert counted.count("gpt-4o") == 5
+    # Only entries reached before the budget ran out, each counted once.
+    assert counted.count("gpt-4") == 3
@@ -0,0 +1,171 @@
+import itertools
+import random
+
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from telegram_ai_agent.chunking import SentenceChunker
+from telegram_ai_agent.clock import VirtualClock
+from telegram_ai_agent.config import TelegramConfig
+from telegram_ai_agent.inbound import InboundMessaging
+from telegram_ai_agent.rate_limiter import AdaptiveRateLimiter
+from telegram_ai_agent.response_cache import ResponseCache
+from telegram_ai_agent.typing_indicator import TypingIndicatorManager
+
+
+@pytest.fixture
+def config():
+    return TelegramConfig(
+        session_name="test_session",
+        api_id=12345,
+        api_hash="test_hash",
+        phone_number="+1234567890",
+        set_typing=False,
+        inter_chunk_delay_min=0,
+        inter_chunk_delay_max=0,
+        read_delay_factor=0,
+        min_read_delay=0.05,
+        max_read_delay=0.05,
+        message_debounce_window=0,
+    )
+
+
+async def get_sender(event):
+    return await event.get_sender()
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    session.send_read_acknowledge = AsyncMock()
+    message_ids = itertools.count(1000)
+    session.send_message = AsyncMock(
+        side_effect=lambda *_: SimpleNamespace(id=next(message_ids), text="", out=True)
+    )
+    session.rate_limiter = AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=100)
+    session.get_sender_entity = AsyncMock(side_effect=get_sender)
+
+    async def iter_messages(*args, **kwargs):
+        for message in ():
+            yield message
+
+    session.iter_messages = MagicMock(side_effect=iter_messages)
+    return session
+
+
+@pytest.fixture
+def text_splitter():
+    splitter = MagicMock()
+    splitter.split_text = MagicMock(side_effect=lambda text: [text])
+    return splitter
+
+
+@pytest.fixture
+def assistant():
+    assistant = MagicMock()
+    assistant.llm.model = "gpt-4o"
+    assistant.get_system_prompt = MagicMock(return_value="Be helpful.")
+    assistant.run = MagicMock(return_value="Hi there!")
+    return assistant
+
+
+def make_event(message_id, text, chat_id=42):
+    sender = SimpleNamespace(id=chat_id, username="user")
+    message = SimpleNamespace(id=message_id, text=text, out=False)
+    return SimpleNamespace(
+        chat_id=chat_id,
+        text=text,
+        message=message,
+        get_sender=AsyncMock(return_value=sender),
+        reply=AsyncMock(
+            return_value=SimpleNamespace(id=message_id + 1, text="", out=True)
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_handle_messages_generates_while_reading(
+    session, config, text_splitter, assistant
+):
+    timeline = []
+    session.send_read_acknowledge.side_effect = lambda *_: timeline.append("read")
+    assistant.run.side_effect = lambda **_: timeline.append("llm") or "Hi there!"
+
+    inbound = InboundMessaging(session, config, text_splitter)
+    event = make_event(1, "hello")
+    await inbound.handle_messages(assistant, [event])
+
+    assert timeline == ["llm", "read"]
+    event.reply.assert_awaited_once_with("Hi there!")
+
+
+@pytest.mark.asyncio
+async def test_handle_messages_merges_batch_into_one_prompt(
+    session, config, text_splitter, assistant
+):
+    inbound = InboundMessaging(session, config, text_splitter)
+    first, second = make_event(1, "hi"), make_event(2, "are you there?")
+
+    await inbound.handle_messages(assistant, [first, second])
+
+    assert assistant.run.call_count == 1
+    assert assistant.run.call_args.kwargs["messages"] == [
+        {"role": "user", "content": "hi"},
+        {"role": "user", "content": "are you there?"},
+    ]
+    second.reply.assert_awaited_once()
+    first.reply.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_handle_messages_in_virtual_time_is_reproducible(
+    session, config, assistant
+):
+    assistant.run.return_value = "First sentence here. " * 3 + "Second one. " * 3
+
+    async def reply_timeline():
+        clock = VirtualClock()
+        virtual_config = replace(
+            config,
+            set_typing=True,
+            inter_chunk_delay_min=1.5,
+            inter_chunk_delay_max=4.0,
+            min_messages=2,
+            max_messages=3,
+            clock=clock,
+            rng=random.Random(7),
+        )
+        session.typing_indicator = TypingIndicatorManager(AsyncMock(), clock=clock)
+        inbound = InboundMessaging(session, virtual_config, SentenceChunker())
+        await inbound.handle_messages(assistant, [make_event(1, "hello")])
+        return clock.timeline
+
+    timeline = await reply_timeline()
+
+    assert timeline == await reply_timeline()
+    assert {entry.label for entry in timeline} == {"read", "typing", "think"}
+    assert sum(entry.delay for entry in timeline) > 5
+
+
+@pytest.mark.asyncio
+async def test_handle_messages_answers_repeated_opening_question_from_cache(
+    session, config, text_splitter, assistant
+):
+    assistant.run_id = "support"
+    assistant.description = "Support agent"
+    assistant.instructions = ["Be brief."]
+    cache = ResponseCache()
+    question = "What are your opening hours?"
+
+    for chat_id in (1, 2):
+        inbound = InboundMessaging(session, config, text_splitter, response_cache=cache)
+        event = make_event(1, question, chat_id=chat_id)
+        await inbound.handle_messages(assistant, [event])
+        event.reply.assert_awaited_once_with("Hi there!")
+
+    assistant.run.assert_called_once()
+    assert len(cache) == 1
+    assert cache.stats.exact_hits == 1
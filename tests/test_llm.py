@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from telegram_ai_agent.llm import LLMRunner
+
+
+@pytest.mark.asyncio
+async def test_llm_runner_runs_off_event_loop():
+    loop_thread = threading.get_ident()
+    assistant = MagicMock()
+    assistant.run = MagicMock(side_effect=lambda **_: threading.get_ident())
+
+    runner = LLMRunner(max_concurrency=2)
+    result = await runner.run(assistant, [{"role": "user", "content": "hi"}])
+
+    assert result != str(loop_thread)
+    assistant.run.assert_called_once_with(
+        messages=[{"role": "user", "content": "hi"}], stream=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_llm_runner_limits_concurrency():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_run(**_):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return "ok"
+
+    assistant = MagicMock()
+    assistant.run = MagicMock(side_effect=slow_run)
+
+    runner = LLMRunner(max_concurrency=2)
+    results = await asyncio.gather(*(runner.run(assistant, []) for _ in range(6)))
+
+    assert results == ["ok"] * 6
+    assert peak == 2
+    assert runner.in_flight == 0
+
+
+def test_llm_runner_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        LLMRunner(max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_llm_runner_streams_deltas():
+    assistant = MagicMock()
+    assistant.run = MagicMock(return_value=iter(["Hel", "lo", "!"]))
+
+    runner = LLMRunner()
+    deltas = [delta async for delta in runner.stream(assistant, [])]
+
+    assert deltas == ["Hel", "lo", "!"]
+    assistant.run.assert_called_once_with(messages=[], stream=True)
+
+
+@pytest.mark.asyncio
+async def test_llm_runner_stream_propagates_errors():
+    def failing_run(**_):
+        yield "partial"
+        raise RuntimeError("api down")
+
+    assistant = MagicMock()
+    assistant.run = MagicMock(side_effect=failing_run)
+
+    runner = LLMRunner()
+    with pytest.raises(RuntimeError, match="api down"):
+        async for _ in runner.stream(assistant, []):
+            pass
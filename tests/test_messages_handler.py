@@ -0,0 +1,88 @@
+import asyncio
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from telegram_ai_agent import messages_handler
+from telegram_ai_agent.config import TelegramConfig
+from telegram_ai_agent.messages_handler import MessagesHandler
+from telegram_ai_agent.typing_indicator import TypingIndicatorManager
+
+
+@pytest.fixture
+def handler():
+    config = TelegramConfig(
+        session_name="test",
+        api_id=1,
+        api_hash="test",
+        phone_number="+10000000000",
+        min_typing_speed=120.0,
+        max_typing_speed=120.0,
+        min_burst_length=5,
+        max_burst_length=10,
+    )
+    session = AsyncMock()
+    session.typing_indicator = TypingIndicatorManager(session)
+    return MessagesHandler(session, config, MagicMock())
+
+
+@pytest.mark.parametrize("numpy_min_words", [10**9, 1])
+def test_plan_typing_covers_every_word(handler, numpy_min_words):
+    text = "word " * 300
+    with patch.object(messages_handler, "NUMPY_MIN_WORDS", numpy_min_words):
+        timeline = handler.plan_typing(text)
+
+    # 300 four-letter words at 120 wpm take 0.4s each, ±10%.
+    total_typing = sum(duration for duration, _ in timeline)
+    assert 300 * 0.36 <= total_typing <= 300 * 0.44
+    assert 30 <= len(timeline) <= 60
+    assert all(0.5 <= pause <= 2.0 for _, pause in timeline[:-1])
+    assert timeline[-1][1] == 0.0
+    assert handler.plan_typing("") == []
+
+
+@pytest.mark.asyncio
+async def test_simulate_typing_sleeps_once_per_burst(handler):
+    handler.scheduler.sleep = sleep = AsyncMock()
+    await handler.simulate_typing("word " * 40, user=MagicMock())
+
+    # No time passes, so the first indicator covers every burst.
+    assert 4 <= sleep.await_count <= 8
+    assert handler.session.await_count == 1
+    assert handler.session.typing_indicator.stats.saved == sleep.await_count - 1
+
+
+@pytest.mark.asyncio
+async def test_simulate_typing_cancels_indicator_when_interrupted(handler):
+    handler.scheduler.sleep = AsyncMock(side_effect=asyncio.CancelledError)
+
+    with pytest.raises(asyncio.CancelledError):
+        await handler.simulate_typing("word " * 40, user=MagicMock())
+
+    assert handler.session.await_count == 2
+    assert handler.session.typing_indicator.stats.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_simulate_typing_respects_typing_indicator_cap(handler):
+    handler.scheduler.max_typing = 0
+    handler.scheduler.sleep = AsyncMock()
+
+    await handler.simulate_typing("word " * 40, user=MagicMock())
+
+    handler.session.assert_not_awaited()
+    assert handler.scheduler.sleep.await_count > 0
+    assert handler.scheduler.stats.typing_skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_simulate_chunks_thinks_only_between_bubbles(handler):
+    handler.scheduler.sleep = sleep = AsyncMock()
+    handler.config.set_typing = False
+
+    sent = [chunk async for chunk in handler.simulate_chunks(["a", "b", "c"], None)]
+
+    assert sent == ["a", "b", "c"]
+    # Nothing is left to wait for once the last bubble is out.
+    assert [call.args[1] for call in sleep.await_args_list] == ["think", "think"]
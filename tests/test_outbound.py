@@ -0,0 +1,198 @@
+import asyncio
+
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from telethon.errors import FloodWaitError, PeerIdInvalidError
+from telethon.tl.types import InputPeerChannel, InputPeerUser
+
+from telegram_ai_agent.config import TelegramConfig
+from telegram_ai_agent.history import ChatHistoryCache
+from telegram_ai_agent.outbound import KnownPeer, OutboundMessaging
+from telegram_ai_agent.rate_limiter import AdaptiveRateLimiter
+
+
+@pytest.fixture
+def config():
+    return TelegramConfig(
+        session_name="test_session",
+        api_id=12345,
+        api_hash="test_hash",
+        phone_number="+1234567890",
+        set_typing=False,
+        inter_chunk_delay_min=0,
+        inter_chunk_delay_max=0,
+        min_messages=2,
+        max_messages=2,
+        outbound_concurrency=2,
+    )
+
+
+@pytest.fixture
+def session():
+    peers = {
+        "@alice": InputPeerUser(user_id=1, access_hash=11),
+        "@bob": InputPeerUser(user_id=2, access_hash=22),
+        "@carol": InputPeerUser(user_id=3, access_hash=33),
+        "@alice_phone": InputPeerUser(user_id=1, access_hash=11),
+        "@channel": InputPeerChannel(channel_id=9, access_hash=99),
+    }
+    session = MagicMock()
+    session.get_cached_input_entity = AsyncMock(side_effect=lambda peer: peers[peer])
+    session.send_message = AsyncMock()
+    session.rate_limiter = AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=100)
+    return session
+
+
+@pytest.fixture
+def text_splitter():
+    splitter = MagicMock()
+    splitter.split_text = MagicMock(side_effect=lambda text: text.split(" | "))
+    return splitter
+
+
+@pytest.mark.asyncio
+async def test_send_messages_runs_conversations_concurrently(
+    session, config, text_splitter
+):
+    active = peak = 0
+
+    async def send_message(user, chunk):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    session.send_message.side_effect = send_message
+    outbound = OutboundMessaging(session, config, text_splitter)
+
+    results = await outbound.send_messages(
+        ["@alice", "@bob", "@carol"], "Hello there. | How are you?"
+    )
+
+    assert [result.recipient for result in results] == ["@alice", "@bob", "@carol"]
+    assert all(result.ok and result.chunks_sent == 2 for result in results)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_send_messages_keeps_bubble_order_per_peer(
+    session, config, text_splitter
+):
+    outbound = OutboundMessaging(session, config, text_splitter)
+
+    await outbound.send_messages(["@alice", "@alice_phone"], "One. | Two.")
+
+    sent = [call.args[1] for call in session.send_message.await_args_list]
+    assert sent == ["One.", "Two.", "One.", "Two."]
+
+
+@pytest.mark.asyncio
+async def test_send_messages_reports_failures_per_recipient(
+    session, config, text_splitter
+):
+    session.send_message.side_effect = [RuntimeError("boom"), None, None]
+    session.get_cached_input_entity.side_effect = [
+        InputPeerUser(1, 11),
+        InputPeerChannel(9, 99),
+        InputPeerUser(2, 22),
+    ]
+    outbound = OutboundMessaging(session, config, text_splitter)
+
+    results = await outbound.send_messages(
+        ["@alice", "@channel", "@bob"], "One. | Two.", concurrency=1
+    )
+
+    assert [result.status for result in results] == ["failed", "skipped", "sent"]
+    assert results[0].error == "boom"
+    assert results[2].chunks_sent == 2
+
+
+@pytest.mark.asyncio
+async def test_send_messages_to_known_peer_skips_resolution(
+    session, config, text_splitter
+):
+    outbound = OutboundMessaging(session, config, text_splitter)
+
+    [result] = await outbound.send_messages([KnownPeer(1, 11, "@alice")], "Hi.")
+
+    assert result.ok
+    assert result.peer == InputPeerUser(1, 11)
+    session.get_cached_input_entity.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_send_messages_resolves_fallback_for_stale_access_hash(
+    session, config, text_splitter
+):
+    session.send_message.side_effect = [PeerIdInvalidError(request=None), None]
+    outbound = OutboundMessaging(session, config, text_splitter)
+
+    [result] = await outbound.send_messages([KnownPeer(1, 99, "@alice")], "Hi.")
+
+    assert result.ok and result.chunks_sent == 1
+    assert result.peer == InputPeerUser(1, 11)
+    session.get_cached_input_entity.assert_awaited_once_with("@alice")
+
+
+@pytest.mark.asyncio
+async def test_send_messages_splits_shared_message_once(session, config, text_splitter):
+    config = replace(config, min_messages=1, max_messages=4, outbound_concurrency=3)
+    outbound = OutboundMessaging(session, config, text_splitter)
+    recipients = ["@alice", "@bob", "@carol"] * 10
+
+    results = await outbound.send_messages(recipients, "One. | Two. | Three. | Four.")
+
+    text_splitter.split_text.assert_called_once()
+    # Each recipient still draws its own bubble count from the shared split.
+    assert len({result.chunks_sent for result in results}) > 1
+    assert all(result.ok for result in results)
+
+
+@pytest.mark.asyncio
+async def test_send_messages_records_bubbles_in_cached_history(
+    session, config, text_splitter
+):
+    async def iter_messages(*args, **kwargs):
+        yield SimpleNamespace(id=1, text="Hi, who is this?", out=False)
+
+    async def send_message(user, chunk):
+        return SimpleNamespace(
+            id=session.send_message.await_count + 1, text=chunk, out=True
+        )
+
+    session.iter_messages = MagicMock(side_effect=iter_messages)
+    session.send_message.side_effect = send_message
+    history = ChatHistoryCache(session)
+    await history.sync(1)
+    outbound = OutboundMessaging(session, config, text_splitter, history=history)
+
+    await outbound.send_messages(["@alice"], "One. | Two.")
+
+    assert await history.get(1) == [
+        {"role": "user", "content": "Hi, who is this?"},
+        {"role": "assistant", "content": "One."},
+        {"role": "assistant", "content": "Two."},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_messages_retries_flood_wait_on_resolution(
+    session, config, text_splitter
+):
+    peer = InputPeerUser(1, 11)
+    session.get_cached_input_entity.side_effect = [
+        FloodWaitError(request=None, capture=0),
+        peer,
+    ]
+    outbound = OutboundMessaging(session, config, text_splitter)
+
+    [result] = await outbound.send_messages(["@alice"], "Hi.")
+
+    assert result.ok and result.peer == peer
+    assert session.rate_limiter.stats.flood_waits == 1
+    assert session.rate_limiter.stats.retries == 1
@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from telethon.errors import FloodWaitError
+
+from telegram_ai_agent.clock import VirtualClock
+from telegram_ai_agent.rate_limiter import AdaptiveRateLimiter
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_paces_sends_after_burst():
+    clock = VirtualClock()
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=2, recovery=0, clock=clock)
+
+    for _ in range(4):
+        await limiter.acquire()
+
+    # Two tokens up front, then one every half second.
+    assert clock.time() == pytest.approx(1.0)
+    assert limiter.stats.acquired == 4
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_retries_after_flood_wait_and_recovers():
+    clock = VirtualClock()
+    limiter = AdaptiveRateLimiter(
+        rate=2.0, burst=1, max_rate=2.0, recovery=0.1, clock=clock
+    )
+    send = AsyncMock(side_effect=[FloodWaitError(request=None, capture=3), "sent"])
+
+    assert await limiter.call(send, "peer", "hello") == "sent"
+
+    assert send.await_count == 2
+    assert clock.time() == pytest.approx(3.0)
+    assert limiter.rate == 1.0
+    assert limiter.stats.flood_waits == limiter.stats.retries == 1
+
+    await clock.sleep(5)
+    await limiter.acquire()
+    assert limiter.rate == pytest.approx(1.5)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_gives_up_on_long_flood_wait():
+    limiter = AdaptiveRateLimiter(max_flood_wait=60, clock=VirtualClock())
+    send = AsyncMock(side_effect=FloodWaitError(request=None, capture=3600))
+
+    with pytest.raises(FloodWaitError):
+        await limiter.call(send)
+
+    send.assert_awaited_once()
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pytest
+
+from langchain_core.embeddings import Embeddings
+
+from telegram_ai_agent.response_cache import (
+    ResponseCache,
+    assistant_scope,
+    normalize_text,
+)
+
+
+class KeywordEmbeddings(Embeddings):
+    """Toy embeddings: one dimension per known keyword."""
+
+    keywords = ["price", "cost", "hours", "open"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        synonyms = {"cost": "price", "open": "hours"}
+        vector = [0.0] * len(self.keywords)
+        for word in text.split():
+            word = synonyms.get(word.strip("?"), word.strip("?"))
+            if word in self.keywords:
+                vector[self.keywords.index(word)] += 1.0
+        return vector
+
+
+def make_assistant(instructions):
+    return SimpleNamespace(
+        run_id="sales",
+        description="Sales rep",
+        instructions=instructions,
+        llm=SimpleNamespace(model="gpt-4o"),
+    )
+
+
+def test_normalize_text_ignores_case_spacing_and_trailing_punctuation():
+    assert normalize_text("  What is the   PRICE?! ") == "what is the price"
+
+
+def test_assistant_scope_changes_with_instructions():
+    assert assistant_scope(make_assistant(["Be brief."])) == assistant_scope(
+        make_assistant(["Be brief."])
+    )
+    assert assistant_scope(make_assistant(["Be brief."])) != assistant_scope(
+        make_assistant(["Be verbose."])
+    )
+
+
+@pytest.mark.asyncio
+async def test_response_cache_exact_match_is_scoped():
+    cache = ResponseCache()
+    await cache.store("scope-a", "What is the price?", ["It's $10."])
+
+    assert await cache.lookup("scope-a", "what is the price") == ["It's $10."]
+    assert await cache.lookup("scope-b", "what is the price") is None
+    assert cache.stats.exact_hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+@pytest.mark.asyncio
+async def test_response_cache_semantic_match_within_threshold():
+    embeddings = KeywordEmbeddings()
+    cache = ResponseCache(embeddings=embeddings, similarity_threshold=0.9)
+    await cache.store("scope", "what's the price?", ["It's $10.", "Want one?"])
+
+    assert await cache.lookup("scope", "how much does it cost?") == [
+        "It's $10.",
+        "Want one?",
+    ]
+    assert await cache.lookup("scope", "when are you open?") is None
+    assert cache.stats.semantic_hits == 1
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_response_cache_reuses_lookup_embedding_when_storing():
+    embeddings = KeywordEmbeddings()
+    cache = ResponseCache(embeddings=embeddings)
+
+    assert await cache.lookup("scope", "opening hours?") is None
+    await cache.store("scope", "opening hours?", ["9 to 5."])
+
+    assert embeddings.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_response_cache_skips_follow_ups_and_short_messages():
+    cache = ResponseCache()
+    follow_up = [
+        {"role": "user", "content": "Do you ship abroad?"},
+        {"role": "assistant", "content": "We do, which country?"},
+        {"role": "user", "content": "And what is the price?"},
+    ]
+
+    await cache.store("scope", "And what is the price?", ["$10."], follow_up)
+    await cache.store("scope", "yes", ["Great!"])
+
+    assert len(cache) == 0
+    assert await cache.lookup("scope", "yes") is None
+    assert await cache.lookup("scope", "And what is the price?") is None
+    assert cache.stats.skipped == 1
+    assert cache.stats.misses == 1
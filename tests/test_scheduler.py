@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import pytest
+
+from telegram_ai_agent.scheduler import TimerWheel
+
+
+@pytest.mark.asyncio
+async def test_timer_wheel_fires_in_deadline_order():
+    wheel = TimerWheel(tick=0.005)
+    fired = []
+    for delay in (0.05, 0.01, 0.03):
+        wheel.call_later(delay, fired.append, delay)
+    cancelled = wheel.call_later(0.02, fired.append, "cancelled")
+    cancelled.cancel()
+
+    assert wheel.pending == 3
+    await asyncio.sleep(0.1)
+
+    assert fired == [0.01, 0.03, 0.05]
+    assert wheel.pending == 0
+    assert (wheel.stats.fired, wheel.stats.cancelled) == (3, 1)
+    assert 0 <= wheel.stats.average_lag <= wheel.stats.max_lag < 0.05
+    await wheel.stop()
+
+
+@pytest.mark.asyncio
+async def test_timer_wheel_cascades_timers_beyond_level_zero():
+    # 4 slots of 5ms per level: 0.02s on level 0, 0.08s on level 1, then parked.
+    wheel = TimerWheel(tick=0.005, slots=4, levels=2)
+    started = time.monotonic()
+
+    elapsed = await asyncio.gather(
+        *(wait(wheel, delay, started) for delay in (0.012, 0.05, 0.15))
+    )
+
+    for delay, took in zip((0.012, 0.05, 0.15), elapsed):
+        assert delay <= took < delay + 0.03
+    await wheel.stop()
+
+
+async def wait(wheel, delay, started):
+    await wheel.sleep(delay)
+    return time.monotonic() - started
+
+
+@pytest.mark.asyncio
+async def test_timer_wheel_sleep_cancellation_clears_pending():
+    wheel = TimerWheel(tick=0.005)
+    task = asyncio.create_task(wheel.sleep(10))
+    await asyncio.sleep(0)
+    assert wheel.pending == 1
+
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert wheel.pending == 0
+    await wheel.stop()
+
+
+def test_typing_slot_caps_simultaneous_indicators():
+    wheel = TimerWheel(max_typing=1)
+
+    with wheel.typing_slot() as first:
+        with wheel.typing_slot() as second:
+            assert (first, second) == (True, False)
+    with wheel.typing_slot() as third:
+        assert third
+
+    assert wheel.typing_active == 0
+    assert wheel.stats.typing_skipped == 1
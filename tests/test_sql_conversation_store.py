@@ -0,0 +1,70 @@
+import importlib
+
+from contextlib import contextmanager
+
+import pytest
+
+from telegram_ai_agent.history import HistoryEntry
+
+
+pytest.importorskip("sqlalchemy")
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    # Keep the app's module-level engine away from the real database file.
+    monkeypatch.setenv("STREAMLIT_APP_DB_PATH", str(tmp_path / "app.db"))
+    conversations = importlib.import_module(
+        "streamlit_app.utils.database.conversations"
+    )
+    models = importlib.import_module("streamlit_app.utils.database.models")
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'conversations.db'}")
+    models.Base.metadata.create_all(engine)
+    make_session = sessionmaker(bind=engine)
+
+    @contextmanager
+    def session_scope():
+        session = make_session()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    yield conversations.SQLConversationStore(1, session_scope=session_scope)
+    engine.dispose()
+
+
+def make_entry(message_id, tokens):
+    role = "assistant" if message_id % 2 else "user"
+    return HistoryEntry(message_id, role, f"message {message_id}", tokens)
+
+
+@pytest.mark.asyncio
+async def test_sql_store_append_ignores_duplicates(store):
+    await store.append(7, [make_entry(1, 10), make_entry(2, 10)])
+    await store.append(7, [make_entry(2, 99), make_entry(3, 10)])
+
+    entries = await store.last_messages(7, limit=10)
+
+    assert [entry.message_id for entry in entries] == [1, 2, 3]
+    assert entries[1].token_count == 10
+    assert await store.last_messages(8, limit=10) == []
+
+
+@pytest.mark.asyncio
+async def test_sql_store_last_messages_fits_token_budget(store):
+    await store.append(7, [make_entry(i, 10 * i) for i in range(1, 6)])
+
+    entries = await store.last_messages(7, limit=10, token_budget=95)
+
+    assert [entry.message_id for entry in entries] == [4, 5]
+    assert [entry.message_id for entry in await store.last_messages(7, 3)] == [
+        3,
+        4,
+        5,
+    ]
@@ -0,0 +1,75 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from telethon.errors import FloodWaitError
+from telethon.tl.types import SendMessageCancelAction, SendMessageTypingAction
+
+from telegram_ai_agent.clock import Clock
+from telegram_ai_agent.rate_limiter import AdaptiveRateLimiter
+from telegram_ai_agent.typing_indicator import TypingIndicatorManager
+
+
+class FakeClock(Clock):
+    def __init__(self):
+        self.now = 100.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.mark.asyncio
+async def test_typing_indicator_refreshes_only_before_expiry(clock):
+    session = AsyncMock()
+    indicator = TypingIndicatorManager(session, clock=clock)
+    peer = MagicMock()
+
+    assert await indicator.ensure(peer) == 5.0
+    clock.now += 3
+    assert await indicator.ensure(peer) == 2.0
+    clock.now += 2.5
+    assert await indicator.ensure(peer) == 5.0
+
+    assert session.await_count == 2
+    assert isinstance(session.await_args.args[0].action, SendMessageTypingAction)
+    assert (indicator.stats.requests, indicator.stats.sent) == (3, 2)
+    assert indicator.stats.saved == 1
+
+
+@pytest.mark.asyncio
+async def test_typing_indicator_cancels_only_live_indicators(clock):
+    session = AsyncMock()
+    indicator = TypingIndicatorManager(session, clock=clock)
+    peer = MagicMock()
+
+    await indicator.cancel(peer)
+    await indicator.ensure(peer)
+    await indicator.cancel(peer)
+
+    assert session.await_count == 2
+    assert isinstance(session.await_args.args[0].action, SendMessageCancelAction)
+    assert indicator.stats.cancelled == 1
+
+    await indicator.ensure(peer)
+    indicator.discard(peer)
+    await indicator.cancel(peer)
+    assert session.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_typing_indicator_retries_after_flood_wait(clock):
+    session = AsyncMock(side_effect=[FloodWaitError(request=None, capture=0), None])
+    limiter = AdaptiveRateLimiter(clock=clock)
+    indicator = TypingIndicatorManager(session, clock=clock, rate_limiter=limiter)
+
+    assert await indicator.ensure(MagicMock()) == 5.0
+
+    assert session.await_count == 2
+    assert limiter.stats.flood_waits == 1
+    # Typing actions don't spend the send budget.
+    assert limiter.stats.acquired == 0